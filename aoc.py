@@ -0,0 +1,155 @@
+"""
+Runs days from the command line, without editing their source.
+
+    $ python -m aoc                          # Every day, both parts, on the full inputs
+    $ python -m aoc 1-5 12 --part 2
+    $ python -m aoc 16 --input test          # inputs/day_16_test.txt
+    $ python -m aoc 9 --input inputs/day_9_test2.txt
+    $ python -m aoc 1-25 --repeat 5 --jobs 4 --format csv > times.csv
+    $ python -m aoc 19 --profile             # cProfile and tracemalloc output in profiles/
+
+With `--repeat`, each run's profile files are named with its run number, so concurrent runs don't overwrite each other.
+
+Each run of a day (every day, times each `--repeat`) is a separate job for the process pool, starting from a fresh
+`Day`, and both of its parts share one parse. Answers on the full and test inputs are checked against `answers.json` and
+`answers_test.json`. `--format json` or `csv` gives one record per part per run, for scripting.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import csv
+import json
+import os
+from pathlib import Path
+import sys
+from typing import Optional
+
+from base import Timer
+from gc_policy import DEFAULT_GC_MODE, GC_MODES
+from runner import (
+    INPUTS_DIR, NOT_RUN, PARTS, TEST_ANSWERS_PATH, DayResult, DaySpec, check, discover_days, load_answers, run_day
+)
+
+
+FIELDS = ('day', 'input', 'part', 'run', 'parse', 'solve', 'gc_total', 'gc_max', 'check', 'answer', 'error')
+
+
+def parse_days(text: str) -> list[int]:
+    "'3', '1-5' or '1,3,20-25'"
+    days = []
+    for item in text.split(','):
+        first, _, last = item.partition('-')
+        try:
+            days.extend(range(int(first), int(last or first) + 1))
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Not a day or range of days: {item!r}")
+    return days
+
+
+def data_filename(day: int, source: str) -> Optional[str]:
+    "What to give `Day()` for `--input`: None for the full input, or a path. Raises FileNotFoundError."
+    if source == 'full':
+        return None
+
+    if source == 'test':
+        filename = f'day_{day}_test.txt'
+        if not INPUTS_DIR.joinpath(filename).exists():
+            raise FileNotFoundError(f"Day {day} has no test input")
+        return filename
+
+    path = Path(source).resolve()
+    if not path.exists():
+        raise FileNotFoundError(f"No input file {path}")
+    return str(path)
+
+
+def records(results: list[tuple[int, DayResult]], source: str) -> list[dict]:
+    answers = {'full': load_answers(), 'test': load_answers(TEST_ANSWERS_PATH)}.get(source, {})
+    rows = []
+    for run, day_result in results:
+        for result in day_result.parts:
+            rows.append({
+                'day': result.day,
+                'input': source,
+                'part': result.part,
+                'run': run,
+                'parse': day_result.parse_elapsed,
+                'solve': result.elapsed,
+                'gc_total': result.gc_pause_total,
+                'gc_max': result.gc_pause_max,
+                'check': check(result, answers) if result.error in (None, *NOT_RUN) else 'ERROR',
+                'answer': result.answer,
+                'error': result.error and result.error.strip().splitlines()[-1],
+            })
+    return rows
+
+
+def print_table(rows: list[dict]):
+    print(f'{"Day":>3}  {"Part":>4}  {"Run":>3}  {"Parse":>8}  {"Solve":>8}  {"GC total":>8}  {"Check":>5}  Answer')
+    for row in rows:
+        answer = (row['answer'] or '') if row['error'] is None else f'ERROR: {row["error"]}'
+        if '\n' in answer:
+            answer = '\n' + answer
+        print(
+            f'{row["day"]:>3}  {row["part"]:>4}  {row["run"]:>3}  {row["parse"]:>7.2f}s  {row["solve"]:>7.2f}s  '
+            f'{row["gc_total"]:>7.3f}s  {row["check"]:>5}  {answer}'
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m aoc', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('days', type=parse_days, nargs='*', help="Days to run, like 3, 1-5 or 1,3,20-25 (default: all)")
+    parser.add_argument('--part', type=int, choices=PARTS, action='append', help='Only this part (can be repeated)')
+    parser.add_argument(
+        '--input', default='full', metavar='test|full|PATH',
+        help="The day's full input (default), its test input, or the file at PATH"
+    )
+    parser.add_argument('--repeat', type=int, default=1, metavar='N', help='Run each day N times')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), metavar='N', help='Worker processes')
+    parser.add_argument('--format', choices=('table', 'json', 'csv'), default='table')
+    parser.add_argument('--gc', choices=GC_MODES, default=DEFAULT_GC_MODE, help='Garbage collector policy')
+    parser.add_argument('--profile', action='store_true', help='Profile each part into profiles/')
+    args = parser.parse_args()
+
+    wanted = {day for days in args.days for day in days}
+    specs: list[DaySpec] = [spec for spec in discover_days() if not wanted or spec.day in wanted]
+    parts = tuple(sorted(set(args.part))) if args.part else PARTS
+
+    runs = []
+    for spec in specs:
+        try:
+            filename = data_filename(spec.day, args.input)
+        except FileNotFoundError as e:
+            print(f'Skipping: {e}', file=sys.stderr)
+            continue
+        runs += [(run, spec, filename) for run in range(1, args.repeat + 1)]
+
+    with Timer() as t, ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [
+            (run, pool.submit(
+                run_day, spec, filename, args.gc, False, parts, args.profile, run if args.repeat > 1 else None
+            ))
+            for run, spec, filename in runs
+        ]
+        results = [(run, future.result()) for run, future in futures]
+
+    results.sort(key=lambda r: (r[1].day, r[0]))
+    rows = records(results, args.input if args.input in ('full', 'test') else 'path')
+
+    if args.format == 'json':
+        print(json.dumps(rows, indent=2))
+    elif args.format == 'csv':
+        writer = csv.DictWriter(sys.stdout, FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        print_table(rows)
+        print(f'\nWall time {t.elapsed:.2f}s')
+
+    if any(row['check'] in ('WRONG', 'ERROR') for row in rows):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
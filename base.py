@@ -1,14 +1,20 @@
-import requests
 from pathlib import Path
 
 from time import perf_counter
-from contextlib import suppress
+from contextlib import contextmanager, nullcontext, suppress
 from functools import cached_property
-import gc
-from typing import Optional
+import mmap
+from typing import Any, Callable, Generator, Optional
+
+from checkpoint import Checkpoint
+from gc_policy import DEFAULT_GC_MODE, GcMode, GcPauses, apply_gc_policy, freeze_parsed
+from metrics import Metrics
+from parse_cache import ParseCache
 
 
 class Timer:
+    elapsed = 0.0
+
     def __enter__(self):
         self.start = perf_counter()
         return self
@@ -19,70 +25,165 @@ class Timer:
 
 class BaseDay:
     day = 0  # Override to get the right input
-
-    def __init__(self, test_data_filename: Optional[str] = None):
+    runnable = True  # Set to False to hide an abandoned attempt from the runner
+    parse_version: Optional[int] = None  # Set to cache `parse()` results on disk. Bump when the parsed shape changes.
+    parse_cache = ParseCache(Path(__file__).parent.joinpath('cache'))
+    # Seconds each part may take in `runner.py --check` before it fails. None leaves a part out, as too slow to check.
+    time_budgets: dict[int, Optional[float]] = {1: 10.0, 2: 10.0}
+    show_progress = True  # Turned off by the runner and benchmark, which have no one watching
+    metrics_dir: Optional[Path] = None  # Set to also write each `metrics()` summary there as JSON
+    checkpoint_dir = Path(__file__).parent.joinpath('checkpoints')
+    checkpoint_interval: Optional[float] = 60.0  # Seconds between checkpoint saves. None turns checkpoints off.
+
+    def __init__(self, test_data_filename: Optional[str] = None, verbosity: int = 0):
         if self.day == 0:
             raise ValueError("Please set the `day` property")
 
         self.data_filename = test_data_filename or f'day_{self.day}.txt'
+        self.verbosity = verbosity
 
-    def load_data(self) -> str:
+    def debug(self, *values, level: int = 1):
+        """
+        Print diagnostic output, only if running at `level` verbosity or higher.
+
+        Values are passed straight to print, so expensive `__str__`s (such as whole grids) are only built when shown.
+        """
+        if self.verbosity >= level:
+            print(*values)
+
+    @cached_property
+    def data_path(self) -> Path:
+        "Path to the input file (relative to `inputs/`, or absolute), downloading it first if it isn't there yet"
         current_dir = Path(__file__).parent
 
         # Check cache first
-        filename = f'inputs/{self.data_filename}'
-        filename_path = current_dir.joinpath(filename)
+        filename_path = current_dir.joinpath('inputs', self.data_filename)
         if filename_path.exists():
-            print(f"Using cached input {filename_path}")
-            return filename_path.read_text()
+            self.debug(f"Using cached input {filename_path}")
+            return filename_path
+
+        if self.data_filename != f'day_{self.day}.txt':
+            raise FileNotFoundError(f"No input file {filename_path}")
 
-        # Download from website
-        cookies = {'session': current_dir.joinpath('inputs/cookie.txt').read_text()}
-        url = f'https://adventofcode.com/2022/day/{self.day}/input'
-        print(f"Fetching {url}")
-        response = requests.get(url, cookies=cookies)
-        response.raise_for_status()
+        # Download from website. Only imported now, as requests is slow to import and inputs are usually cached.
+        from prefetch import Prefetcher
+        prefetcher = Prefetcher(jobs=1)
+        self.debug(f"Fetching {prefetcher.url(self.day)}")
+        prefetcher.fetch(self.day)
 
-        data = response.text
-        filename_path.write_text(data)
+        return filename_path
 
-        return data
+    def load_data(self) -> str:
+        return self.data_path.read_text()
+
+    @cached_property
+    def data(self) -> str:
+        return self.load_data()
 
     @cached_property
     def data_lines(self) -> list[str]:
-        data = self.load_data()
-        return data.split('\n')[:-1]
+        "All lines held in memory. Prefer `iter_lines` or `data_view` for line-at-a-time processing of big inputs."
+        return self.data.split('\n')[:-1]
+
+    def iter_lines(self) -> Generator[str, None, None]:
+        "Stream the input one line (without its newline) at a time"
+        with self.data_path.open() as f:
+            for line in f:
+                yield line.rstrip('\n')
+
+    @contextmanager
+    def data_view(self) -> Generator[memoryview, None, None]:
+        "The raw input bytes, memory-mapped so the OS pages it in as needed rather than reading it all up front"
+        with self.data_path.open('rb') as f:
+            if self.data_path.stat().st_size == 0:
+                yield memoryview(b'')  # Can't mmap an empty file
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                view = memoryview(mm)
+                try:
+                    yield view
+                finally:
+                    view.release()
+
+    def metrics(self, name: str) -> Metrics:
+        "Progress counters for a long loop (see metrics.py), shown on stderr while it runs"
+        output = None
+        if self.metrics_dir is not None:
+            output = self.metrics_dir.joinpath(f'day_{self.day}_{name.replace(" ", "_")}.json')
+        return Metrics(
+            f'Day {self.day} {name}', enabled=self.show_progress or output is not None, show=self.show_progress,
+            output=output
+        )
+
+    def checkpoint(self, name: str, context: Optional[Callable[[], Any]] = None) -> Checkpoint:
+        "Somewhere for a long part to save its progress to, and resume from after an interrupt (see checkpoint.py)"
+        cls = type(self)
+        key = ParseCache.make_key(self.data, f'{cls.__module__}.{cls.__qualname__}.{name.replace(" ", "_")}', 1)
+        checkpoint = Checkpoint(self.checkpoint_dir.joinpath(key + '.checkpoint'), self.checkpoint_interval, context)
+        if checkpoint.enabled:
+            self.debug(f"Checkpointing {name} every {self.checkpoint_interval}s to {checkpoint.path}")
+        return checkpoint
+
+    def parse(self) -> Any:
+        """
+        Build the input structure that both parts work from. Override this rather than loading in each part.
+
+        The result is shared via `self.parsed`, so parts mustn't change it. Days that need to mutate it should give
+        the structure a cheap `copy()` and work on that. Days that stream their input in each part don't need one.
+        """
+        return None
 
-    def part_1(self):
+    @cached_property
+    def parsed(self) -> Any:
+        if self.parse_version is None:
+            return self.parse()
+
+        cls = type(self)
+        key = self.parse_cache.make_key(self.data, f'{cls.__module__}.{cls.__qualname__}', self.parse_version)
+        value = self.parse_cache.get(key)
+        if value is None:
+            self.debug("Parsing (no cached parse)")
+            value = self.parse()
+            self.parse_cache.put(key, value)
+
+        return value
+
+    def part_1(self) -> Any:
+        "Return the answer to part 1. Use `self.debug` rather than print for anything else."
         raise NotImplementedError("Part 1 not yet implemented")
 
-    def part_2(self):
+    def part_2(self) -> Any:
+        "Return the answer to part 2. Use `self.debug` rather than print for anything else."
         raise NotImplementedError("Part 2 not yet implemented")
 
-    def execute(self):
-        with suppress(NotImplementedError):
-            with Timer() as t:
-                print("Starting part 1...")
-                self.part_1()
-
-            print(f"Done in {t.elapsed:.2f}s")
-
-        with suppress(NotImplementedError):
-            with Timer() as t:
-                print("Starting part 2...")
-                self.part_2()
-            
-            print(f"Done in {t.elapsed:.2f}s")
-
-    def setup_gc(self):
+    def execute(self, profile: bool = False, gc_mode: GcMode = DEFAULT_GC_MODE):
         """
-        Suggested here: https://mkennedy.codes/posts/python-gc-settings-change-this-and-make-your-app-go-20pc-faster/
+        Run both parts, printing answers and timings, with the garbage collector set up as `gc_mode` (see gc_policy.py).
 
-        Seems to work well. It's important that it only happens once ever in the python process.
+        With `profile`, each part runs under cProfile and tracemalloc (see profiling.py), and memory and GC figures are
+        printed with the time. Profiling slows things down, so those times aren't comparable with normal runs.
         """
-        # gc.set_debug(gc.DEBUG_STATS)  # Enable to have each GC printed to the console
-        allocs, gen1, gen2 = gc.get_threshold()
-        allocs = 50_000  # Start the GC sequence every 50K not 700 allocations.
-        gen1 = gen1 * 2
-        gen2 = gen2 * 2
-        gc.set_threshold(allocs, gen1, gen2)
\ No newline at end of file
+        if profile:
+            from profiling import PartProfiler  # Only loads cProfile and tracemalloc when they're wanted
+
+        apply_gc_policy(gc_mode)
+
+        with Timer() as t:
+            self.parsed
+        print(f"Parsed in {t.elapsed:.2f}s")
+        freeze_parsed(gc_mode)
+
+        for part in (1, 2):
+            with suppress(NotImplementedError):
+                print(f"Starting part {part}...")
+                with (
+                    PartProfiler(self.day, part) if profile else nullcontext() as profiler,
+                    GcPauses() as pauses,
+                    Timer() as t,
+                ):
+                    answer = getattr(self, f'part_{part}')()
+
+                print(f"Answer:\n{answer}" if '\n' in str(answer) else f"Answer: {answer}")
+                print(f"Done in {t.elapsed:.2f}s" + (f" ({profiler.summary()})" if profiler else ''))
+                print(pauses.summary())
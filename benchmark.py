@@ -0,0 +1,351 @@
+"""
+Repeatedly times each part so that regressions can be told apart from noise.
+
+    $ python benchmark.py --days 1 2 3 --runs 10 --output bench.json
+    $ python benchmark.py --days 1 2 3 --runs 10 --baseline bench.json --threshold 0.1
+
+A parse or solve is only flagged as slower if it's both over the threshold and at least `--min-delta` seconds slower,
+so stages that take microseconds don't fail on noise alone.
+
+With `--scaling`, each day that has a generator (see generators.py) is instead run on generated inputs of each of the
+given scales, and the growth rate of its parse plus solve time is estimated (with the parse cache off, so parsing is
+really done each time):
+
+    $ python benchmark.py --scaling 1 10 100
+
+With `--imports`, it instead measures how long each day's module takes to import in a fresh interpreter (via
+`python -X importtime`), and fails if any takes longer than `--import-budget` milliseconds:
+
+    $ python benchmark.py --imports --import-budget 50
+"""
+import argparse
+from contextlib import redirect_stderr, redirect_stdout
+import importlib
+import io
+import json
+import math
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import traceback
+from typing import NamedTuple, Optional
+
+from base import Timer
+from generators import GENERATORS, generate
+from gc_policy import DEFAULT_GC_MODE, GC_MODES, GcMode, apply_gc_policy, freeze_parsed
+from runner import PARTS, DaySpec, discover_days
+
+
+def summarise(samples: list[float]) -> tuple[float, float, float]:
+    "min, median and (nearest-rank) p95"
+    ordered = sorted(samples)
+    p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+    return ordered[0], statistics.median(ordered), p95
+
+
+class PartStats(NamedTuple):
+    day: int
+    part: int
+    runs: int
+    min: float
+    median: float
+    p95: float
+    parse_min: float
+    parse_median: float
+    parse_p95: float
+
+    @classmethod
+    def from_samples(cls, day: int, part: int, samples: list[float], parse_samples: list[float]) -> 'PartStats':
+        return cls(day, part, len(samples), *summarise(samples), *summarise(parse_samples))
+
+
+class PartFailure(NamedTuple):
+    day: int
+    part: int
+    error: str
+
+
+class Regression(NamedTuple):
+    day: int
+    part: int
+    stage: str  # 'parse' or 'solve'
+    baseline: float
+    current: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.current / self.baseline - 1
+
+
+def benchmark_part(
+    spec: DaySpec, part: int, runs: int, warmup: int, gc_mode: GcMode = DEFAULT_GC_MODE,
+    data_filename: Optional[str] = None, use_parse_cache: bool = True
+) -> Optional[PartStats | PartFailure]:
+    day_cls = getattr(importlib.import_module(spec.module), spec.class_name)
+    samples = []
+    parse_samples = []
+
+    for n in range(warmup + runs):
+        # A fresh instance each time, so no cached_property carries over between runs.
+        # Parsing (including loading the input) and solving are timed separately.
+        day = day_cls(data_filename)
+        day.show_progress = False
+        day.checkpoint_interval = None
+        if not use_parse_cache:
+            day.parse_version = None
+        apply_gc_policy(gc_mode)
+        with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+            try:
+                with Timer() as parse_t:
+                    day.parsed
+                freeze_parsed(gc_mode)
+                with Timer() as t:
+                    getattr(day, f'part_{part}')()
+            except NotImplementedError:
+                return None
+            except Exception:
+                return PartFailure(spec.day, part, traceback.format_exc())
+
+        if n >= warmup:
+            samples.append(t.elapsed)
+            parse_samples.append(parse_t.elapsed)
+
+    return PartStats.from_samples(spec.day, part, samples, parse_samples)
+
+
+def growth_exponent(sizes: list[int], times: list[float]) -> Optional[float]:
+    "k in time ~ size^k, from a least squares fit of log(time) against log(size)"
+    points = [(math.log(n), math.log(t)) for n, t in zip(sizes, times) if t > 0]
+    if len(points) < 2:
+        return None
+
+    mean_x = statistics.fmean(x for x, _ in points)
+    mean_y = statistics.fmean(y for _, y in points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+class ScalingResult(NamedTuple):
+    day: int
+    part: int
+    input_bytes: list[int]
+    parse_medians: list[float]
+    solve_medians: list[float]
+
+    @property
+    def medians(self) -> list[float]:
+        "Parse plus solve, as some days do most of their work in `parse()`"
+        return [parse + solve for parse, solve in zip(self.parse_medians, self.solve_medians)]
+
+    @property
+    def exponent(self) -> Optional[float]:
+        return growth_exponent(self.input_bytes, self.medians)
+
+
+def benchmark_scaling(
+    spec: DaySpec, scales: list[int], runs: int, warmup: int, gc_mode: GcMode, seed: int = 0, limit: float = 30.0
+) -> list[ScalingResult | PartFailure]:
+    "Once a part takes longer than `limit` seconds, it isn't tried at any larger scale"
+    filenames = [generate(spec.day, scale, seed) for scale in scales]
+    sizes = [Path(__file__).parent.joinpath('inputs', filename).stat().st_size for filename in filenames]
+    results = []
+
+    for part in PARTS:
+        parse_medians = []
+        solve_medians = []
+        for filename in filenames:
+            stats = benchmark_part(spec, part, runs, warmup, gc_mode, filename, use_parse_cache=False)
+            if stats is None or isinstance(stats, PartFailure):
+                break
+            parse_medians.append(stats.parse_median)
+            solve_medians.append(stats.median)
+            if stats.parse_median + stats.median > limit:
+                break
+
+        if isinstance(stats, PartFailure):
+            results.append(stats)
+        elif stats is not None:
+            results.append(ScalingResult(spec.day, part, sizes[:len(solve_medians)], parse_medians, solve_medians))
+
+    return results
+
+
+def report_scaling(results: list[ScalingResult | PartFailure], scales: list[int]):
+    print(f'{"Day":>3}  {"Part":>4}  ' + '  '.join(f'{"x" + str(scale):>9}' for scale in scales) + '  Growth')
+    skipped = f'{"-":>9}'
+    for r in results:
+        if isinstance(r, PartFailure):
+            print(f'{r.day:>3}  {r.part:>4}  ERROR: {r.error.strip().splitlines()[-1]}')
+            continue
+
+        total, parse, solve = (
+            f'n^{k:.2f}' if k is not None else '?'
+            for k in (r.exponent, growth_exponent(r.input_bytes, r.parse_medians),
+                      growth_exponent(r.input_bytes, r.solve_medians))
+        )
+        growth = f'~ O({total}) (parse {parse}, solve {solve})'
+        times = [f'{t:>8.4f}s' for t in r.medians] + [skipped] * (len(scales) - len(r.medians))
+        print(f'{r.day:>3}  {r.part:>4}  ' + '  '.join(times) + f'  {growth}')
+
+
+class ImportCost(NamedTuple):
+    module: str
+    total: float  # Seconds, including everything it imported
+    heaviest: list[tuple[str, float]]  # The modules it pulled in that took the longest themselves
+
+
+def import_cost(module: str, runs: int) -> ImportCost:
+    "The fastest of `runs` imports of `module`, each in a new interpreter"
+    costs = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        )
+
+        # Lines are "import time: self [us] | cumulative | name", with a module's own imports listed (indented) just
+        # before it, so everything since the previous unindented line belongs to it
+        nested: list[tuple[str, float]] = []
+        for line in result.stderr.splitlines():
+            fields = line.removeprefix('import time:').split('|')
+            if len(fields) != 3 or not fields[0].strip().isdigit():
+                continue
+
+            self_us, cumulative_us, name = int(fields[0]), int(fields[1]), fields[2].rstrip()
+            if name.strip() == module and not name.startswith('  '):
+                nested.sort(key=lambda n: n[1], reverse=True)
+                costs.append(ImportCost(module, cumulative_us / 1e6, nested[:3]))
+                break
+            if not name.startswith('  '):
+                nested = []
+            else:
+                nested.append((name.strip(), self_us / 1e6))
+
+    return min(costs, key=lambda c: c.total)
+
+
+def report_imports(costs: list[ImportCost], budget: float) -> list[ImportCost]:
+    "Print import times and return those over budget"
+    over = []
+    print(f'{"Module":<8}  {"Import":>8}  Heaviest')
+    for cost in costs:
+        heaviest = ', '.join(f'{name} {t * 1000:.1f}ms' for name, t in cost.heaviest)
+        flag = '  OVER BUDGET' if cost.total > budget else ''
+        print(f'{cost.module:<8}  {cost.total * 1000:>6.1f}ms  {heaviest}{flag}')
+        if cost.total > budget:
+            over.append(cost)
+
+    return over
+
+
+def write_json(stats: list[PartStats], path: Path):
+    path.write_text(json.dumps([s._asdict() for s in stats], indent=2))
+
+
+def read_json(path: Path) -> list[PartStats]:
+    return [PartStats(**s) for s in json.loads(path.read_text())]
+
+
+def compare(
+    stats: list[PartStats], baseline: list[PartStats], threshold: float, min_delta: float = 0.0
+) -> list[Regression]:
+    """
+    Flag every parse or solve whose median is more than `threshold` (a fraction) slower than the baseline median, and
+    also more than `min_delta` seconds slower
+    """
+    baseline_by_part = {(s.day, s.part): s for s in baseline}
+    regressions = []
+
+    for s in stats:
+        base = baseline_by_part.get((s.day, s.part))
+        if base is None:
+            continue
+
+        for stage, base_median, median in (('parse', base.parse_median, s.parse_median), ('solve', base.median, s.median)):
+            if base_median and median > base_median * (1 + threshold) and median - base_median > min_delta:
+                regressions.append(Regression(s.day, s.part, stage, base_median, median))
+
+    return regressions
+
+
+def report(stats: list[PartStats], failures: list[PartFailure], regressions: list[Regression]):
+    print(
+        f'{"Day":>3}  {"Part":>4}  {"Runs":>4}  {"Parse min":>10}  {"median":>9}  {"p95":>9}  '
+        f'{"Solve min":>10}  {"median":>9}  {"p95":>9}'
+    )
+    for s in stats:
+        line = (
+            f'{s.day:>3}  {s.part:>4}  {s.runs:>4}  {s.parse_min:>9.4f}s  {s.parse_median:>8.4f}s  {s.parse_p95:>8.4f}s  '
+            f'{s.min:>9.4f}s  {s.median:>8.4f}s  {s.p95:>8.4f}s'
+        )
+        for r in regressions:
+            if (r.day, r.part) == (s.day, s.part):
+                line += f'  {r.stage} SLOWER by {r.slowdown:.0%}'
+        print(line)
+
+    for f in failures:
+        print(f'{f.day:>3}  {f.part:>4}  ERROR: {f.error.strip().splitlines()[-1]}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--days', type=int, nargs='*', help='Days to benchmark (default: all)')
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--output', type=Path, help='Write results as JSON')
+    parser.add_argument('--baseline', type=Path, help='JSON results from a previous run to compare against')
+    parser.add_argument('--gc', choices=GC_MODES, default=DEFAULT_GC_MODE, help='Garbage collector policy')
+    parser.add_argument('--scaling', type=int, nargs='+', metavar='SCALE', help='Scaling benchmark at these input scales')
+    parser.add_argument('--limit', type=float, default=30.0, help='Scaling: stop growing a part once it takes this long')
+    parser.add_argument('--imports', action='store_true', help='Measure import time instead')
+    parser.add_argument('--import-budget', type=float, default=50.0, help='Imports: milliseconds allowed per day')
+    parser.add_argument('--threshold', type=float, default=0.1, help='Allowed slowdown before flagging, e.g. 0.1 = 10%%')
+    parser.add_argument(
+        '--min-delta', type=float, default=0.005, help='Seconds slower a stage must also be before flagging (noise floor)'
+    )
+    args = parser.parse_args()
+
+    specs = [spec for spec in discover_days() if not args.days or spec.day in args.days]
+
+    if args.scaling:
+        scaling_results = []
+        for spec in specs:
+            if spec.day in GENERATORS:
+                scaling_results.extend(benchmark_scaling(
+                    spec, args.scaling, args.runs, args.warmup, args.gc, limit=args.limit
+                ))
+        report_scaling(scaling_results, args.scaling)
+        return
+
+    if args.imports:
+        modules = sorted({spec.module for spec in specs})
+        over = report_imports([import_cost(module, args.runs) for module in modules], args.import_budget / 1000)
+        if over:
+            sys.exit(1)
+        return
+
+    stats = []
+    failures = []
+    for spec in specs:
+        for part in PARTS:
+            result = benchmark_part(spec, part, args.runs, args.warmup, args.gc)
+            if isinstance(result, PartStats):
+                stats.append(result)
+            elif isinstance(result, PartFailure):
+                failures.append(result)
+
+    regressions = compare(stats, read_json(args.baseline), args.threshold, args.min_delta) if args.baseline else []
+    report(stats, failures, regressions)
+
+    if args.output:
+        write_json(stats, args.output)
+
+    if regressions or failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
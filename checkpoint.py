@@ -0,0 +1,106 @@
+"""
+Checkpoints for long running parts, so an interrupted run can carry on from where it got to.
+
+    checkpoint = self.checkpoint('part 2')
+    saved = checkpoint.load()  # None on a fresh start
+    ...
+    for ...:
+        if checkpoint.due():
+            checkpoint.save(progress)
+    checkpoint.clear()  # Finished, so the next run starts from scratch
+
+`due()` only compares the clock against the next save time, so it's cheap enough to call every step. Each save is a
+pickle compressed with zlib, behind a short header holding a format version and a CRC of the body. It's written to a
+temporary file and renamed into place, so an interrupt mid-save leaves the previous checkpoint intact. A checkpoint that
+won't load (truncated, from an older format, or referring to classes that have since changed) is thrown away.
+
+A `context` function, if given, is called at each save for any small caller state to store alongside the main one (the
+answers so far, the best found...). `load()` returns both as a `Saved`.
+"""
+import os
+from pathlib import Path
+import pickle
+import struct
+from time import perf_counter
+from typing import Any, Callable, NamedTuple, Optional
+import zlib
+
+
+MAGIC = b'AOCK'
+VERSION = 1
+HEADER = struct.Struct('<4sBI')  # Magic, format version, CRC-32 of the compressed body
+
+
+class Saved(NamedTuple):
+    context: Any
+    state: Any
+
+
+class Checkpoint:
+    def __init__(
+        self, path: Path, interval: Optional[float] = 60.0, context: Optional[Callable[[], Any]] = None, level: int = 1
+    ):
+        self.path = path
+        self.interval = interval  # Seconds between saves. None turns saving (and loading) off.
+        self.context = context
+        self.level = level  # zlib level. Low, as these are written while the clock is running.
+
+        self.next_save = perf_counter() + interval if interval is not None else float('inf')
+        self.saves = 0
+        self.save_time = 0.0
+        self.size = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.interval is not None
+
+    def due(self) -> bool:
+        return perf_counter() >= self.next_save
+
+    def save(self, state: Any):
+        if not self.enabled:
+            return
+
+        start = perf_counter()
+        context = self.context() if self.context is not None else None
+        body = zlib.compress(pickle.dumps((context, state), protocol=pickle.HIGHEST_PROTOCOL), self.level)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with temp_path.open('wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, zlib.crc32(body)))
+            f.write(body)
+        os.replace(temp_path, self.path)
+
+        end = perf_counter()
+        self.saves += 1
+        self.save_time += end - start
+        self.size = HEADER.size + len(body)
+        self.next_save = end + self.interval
+
+    def load(self) -> Optional[Saved]:
+        "What was last saved, or None if there's no usable checkpoint"
+        if not self.enabled:
+            return None
+
+        try:
+            raw = self.path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            magic, version, crc = HEADER.unpack_from(raw)
+            body = raw[HEADER.size:]
+            if magic != MAGIC or version != VERSION or zlib.crc32(body) != crc:
+                raise ValueError("Not a usable checkpoint")
+            return Saved(*pickle.loads(zlib.decompress(body)))
+        except Exception:
+            self.clear()
+            return None
+
+    def clear(self):
+        self.path.unlink(missing_ok=True)
+
+    def summary(self) -> str:
+        "The cost of checkpointing so far"
+        return f'{self.saves} checkpoints saved in {self.save_time:.3f}s, last {self.size / 1024:.0f}KB'
@@ -0,0 +1,73 @@
+"""
+2D and 3D points packed into single ints, for hot loops that would otherwise build a Coord tuple per neighbour probe.
+
+Each axis gets BITS bits, stored with a bias so negative values work. Packing is linear, so moving a point is just
+adding a packed offset (`pack2(x, y) + offset2(dx, dy) == pack2(x + dx, y + dy)`), as long as every axis stays within
+[-LIMIT, LIMIT). For points on a bounded grid, the flat indexes of `grid.Grid` are cheaper still.
+"""
+from typing import Iterable
+
+
+BITS = 20
+LIMIT = 1 << (BITS - 1)
+MASK = (1 << BITS) - 1
+
+
+def pack2(x: int, y: int) -> int:
+    return ((y + LIMIT) << BITS) | (x + LIMIT)
+
+
+def unpack2(point: int) -> tuple[int, int]:
+    return (point & MASK) - LIMIT, (point >> BITS) - LIMIT
+
+
+def offset2(dx: int, dy: int) -> int:
+    return (dy << BITS) + dx
+
+
+def pack3(x: int, y: int, z: int) -> int:
+    return ((((z + LIMIT) << BITS) | (y + LIMIT)) << BITS) | (x + LIMIT)
+
+
+def unpack3(point: int) -> tuple[int, int, int]:
+    return (point & MASK) - LIMIT, ((point >> BITS) & MASK) - LIMIT, (point >> (2 * BITS)) - LIMIT
+
+
+def offset3(dx: int, dy: int, dz: int) -> int:
+    return (dz << (2 * BITS)) + (dy << BITS) + dx
+
+
+# Right, left, up, down (y increasing downwards), then the diagonals
+NEIGHBOURS_2D = (offset2(1, 0), offset2(-1, 0), offset2(0, -1), offset2(0, 1))
+DIAGONALS_2D = (offset2(-1, -1), offset2(1, -1), offset2(-1, 1), offset2(1, 1))
+NEIGHBOURS_3D = (
+    offset3(0, 0, 1), offset3(0, 0, -1),
+    offset3(0, 1, 0), offset3(0, -1, 0),
+    offset3(1, 0, 0), offset3(-1, 0, 0),
+)
+
+
+def neighbours(point: int, offsets: Iterable[int] = NEIGHBOURS_2D) -> list[int]:
+    return [point + offset for offset in offsets]
+
+
+def manhattan2(a: int, b: int) -> int:
+    ax, ay = unpack2(a)
+    bx, by = unpack2(b)
+    return abs(ax - bx) + abs(ay - by)
+
+
+def manhattan3(a: int, b: int) -> int:
+    return sum(abs(m - n) for m, n in zip(unpack3(a), unpack3(b)))
+
+
+def bounds2(points: Iterable[int]) -> tuple[tuple[int, int], tuple[int, int]]:
+    "((min_x, min_y), (max_x, max_y)) of some packed 2D points"
+    xs, ys = zip(*(unpack2(point) for point in points))
+    return (min(xs), min(ys)), (max(xs), max(ys))
+
+
+def bounds3(points: Iterable[int]) -> tuple[tuple[int, int, int], tuple[int, int, int]]:
+    "((min_x, min_y, min_z), (max_x, max_y, max_z)) of some packed 3D points"
+    xs, ys, zs = zip(*(unpack3(point) for point in points))
+    return (min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs))
@@ -0,0 +1,59 @@
+"""
+Cycle detection for long running simulations, so they can skip ahead to (say) step 10^12.
+
+The simulation is given as an iterable of `(fingerprint, value)` pairs, one per step. The fingerprint identifies the
+state after that step: it should be small and hashable, and the same whenever the simulation would carry on the same
+way. Fingerprints are kept in a hashed history until one repeats. Use None for steps that shouldn't be matched (e.g.
+before the state is fully formed).
+
+The value is what's being measured (a height, a count...), as an int or a tuple of ints, and is assumed to change
+by the same amount every time round the cycle.
+"""
+from typing import Hashable, Iterable, NamedTuple, Optional, TypeVar
+
+
+Value = TypeVar('Value', int, tuple[int, ...])
+
+
+def _combine(a: Value, b: Value, times: int = 1) -> Value:
+    "a + b * times, for ints or tuples of ints"
+    if isinstance(a, tuple):
+        return tuple(x + y * times for x, y in zip(a, b))  # type: ignore
+    return a + b * times
+
+
+class Cycle(NamedTuple):
+    start: int  # Number of steps before the cycle begins
+    period: int  # Number of steps in each repeat
+    values: list  # values[n - 1] is the value after n steps, up to the end of the first repeat
+
+    @property
+    def delta(self):
+        "How much the value changes each time round the cycle"
+        return _combine(self.values[self.start + self.period - 1], self.values[self.start - 1], -1)
+
+    def value_after(self, steps: int):
+        if steps <= len(self.values):
+            return self.values[steps - 1]
+
+        cycles, offset = divmod(steps - self.start, self.period)
+        return _combine(self.values[self.start + offset - 1], self.delta, cycles)
+
+
+def find_cycle(steps: Iterable[tuple[Optional[Hashable], Value]]) -> Optional[Cycle]:
+    "Consume steps until a fingerprint repeats. None if they run out first."
+    seen: dict[Hashable, int] = {}
+    values = []
+
+    for n, (fingerprint, value) in enumerate(steps, 1):
+        values.append(value)
+        if fingerprint is None:
+            continue
+
+        if fingerprint in seen:
+            start = seen[fingerprint]
+            return Cycle(start, n - start, values)
+
+        seen[fingerprint] = n
+
+    return None
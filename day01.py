@@ -1,26 +1,39 @@
-
+import heapq
+import itertools
+from typing import Iterable
 from base import BaseDay
 
 
-class Day01(BaseDay):
-    day = 1
+def top_group_sums(lines: Iterable[str], k: int) -> list[int]:
+    "The `k` largest totals of the blank line separated groups, largest first. Only `k` totals are held at once."
+    heap: list[int] = []  # Min-heap, so the smallest of the best so far is the one to beat
+    total = 0
 
-    def part_1(self):
-        elves = [0]
-        for line in self.data_lines:
-            if line == '':
-                elves.append(0)
-                continue
+    # The extra blank line ends the last group
+    for line in itertools.chain(lines, ('',)):
+        if line:
+            total += int(line)
+            continue
+
+        if len(heap) < k:
+            heapq.heappush(heap, total)
+        elif total > heap[0]:
+            heapq.heapreplace(heap, total)
+        total = 0
 
-            elves[-1] += int(line)
+    return sorted(heap, reverse=True)
 
-        self.elves = elves
 
-        print(max(elves))
+class Day01(BaseDay):
+    day = 1
+
+    def part_1(self):
+        return top_group_sums(self.iter_lines(), 1)[0]
 
     def part_2(self):
-        sorted_elves = list(sorted(self.elves))
-        print(sorted_elves[-3:])
-        print(sum(sorted_elves[-3:]))
+        top_three = top_group_sums(self.iter_lines(), 3)
+        self.debug(top_three)
+        return sum(top_three)
 
-Day01().execute()
+if __name__ == '__main__':
+    Day01().execute()
@@ -1,75 +1,76 @@
-from typing import Literal
 from base import BaseDay
 
 
+# A, B, C = Rock, Paper, Scissors
+# X, Y, Z = Rock, Paper, Scissors
+CHOICE_SCORES = {
+    'X': 1,
+    'Y': 2,
+    'Z': 3
+}
+
+WIN = 6
+DRAW = 3
+LOSS = 0
+GAME_SCORES = {
+    'AX': DRAW,
+    'AY': WIN,
+    'AZ': LOSS,
+    'BX': LOSS,
+    'BY': DRAW,
+    'BZ': WIN,
+    'CX': WIN,
+    'CY': LOSS,
+    'CZ': DRAW,
+}
+
+# For part 2, X, Y, Z = lose, draw, win, giving what to play
+TURNS = {
+    'AX': 'Z',
+    'AY': 'X',
+    'AZ': 'Y',
+    'BX': 'X',
+    'BY': 'Y',
+    'BZ': 'Z',
+    'CX': 'Y',
+    'CY': 'Z',
+    'CZ': 'X',
+}
+
+# Only 9 different lines are possible, so each part's score is just how often each occurs times what it scores
+ROUNDS = [(them, second) for them in 'ABC' for second in 'XYZ']
+ROUND_BYTES = [f'{them} {second}'.encode() for them, second in ROUNDS]
+
+
+def round_score(them: str, me: str) -> int:
+    return CHOICE_SCORES[me] + GAME_SCORES[them + me]
+
+
+PART_1_SCORES = [round_score(them, me) for them, me in ROUNDS]
+PART_2_SCORES = [round_score(them, TURNS[them + desired_result]) for them, desired_result in ROUNDS]
+
+CHUNK_SIZE = 1 << 20
+
+
 class Day(BaseDay):
     day = 2
 
-    def get_my_score(self, them: Literal['A', 'B', 'C'], me: Literal['X', 'Y', 'Z']) -> int:
-        # A, B, C = Rock, Paper, Scissors
-        # X, Y, Z = Rock, Paper, Scissors
-
-        choice_scores = {
-            'X': 1,
-            'Y': 2,
-            'Z': 3
-        }
-
-        WIN = 6
-        DRAW = 3
-        LOSS = 0
-        game_scores = {
-            'AX': DRAW,
-            'AY': WIN,
-            'AZ': LOSS,
-            'BX': LOSS,
-            'BY': DRAW,
-            'BZ': WIN,
-            'CX': WIN,
-            'CY': LOSS,
-            'CZ': DRAW,
-        }
-
-        return choice_scores[me] + game_scores[f'{them}{me}']
+    def parse(self) -> list[int]:
+        "How many times each line in ROUNDS occurs, counted a chunk of raw bytes at a time"
+        counts = [0] * len(ROUNDS)
+        with self.data_path.open('rb') as f:
+            # Finish each chunk at the end of a line, so no round is split between two
+            while chunk := f.read(CHUNK_SIZE) + f.readline():
+                for idx, line in enumerate(ROUND_BYTES):
+                    counts[idx] += chunk.count(line)
+
+        return counts
 
     def part_1(self):
-        score = 0
-        for line in self.data_lines:
-            if line == '':
-                continue
-
-            them, me = line.split(' ')
-            score += self.get_my_score(them, me)
-
-        print(f'Score is {score}')
-
-    def get_my_turn(self, them: Literal['A', 'B', 'C'], desired_result: Literal['X', 'Y', 'Z']) -> Literal['X', 'Y', 'Z']:
-        # X, Y, Z = lose, draw, win
-        # A, B, C = Rock, Paper, Scissors
-        # X, Y, Z = Rock, Paper, Scissors
-        turns = {
-            'AX': 'Z',
-            'AY': 'X',
-            'AZ': 'Y',
-            'BX': 'X',
-            'BY': 'Y',
-            'BZ': 'Z',
-            'CX': 'Y',
-            'CY': 'Z',
-            'CZ': 'X',
-        }
-        return turns[f'{them}{desired_result}']
+        return sum(count * score for count, score in zip(self.parsed, PART_1_SCORES))
 
     def part_2(self):
-        score = 0
-        for line in self.data_lines:
-            if line == '':
-                continue
-
-            them, desired_result = line.split(' ')
-            me = self.get_my_turn(them, desired_result)
-            score += self.get_my_score(them, me)
-
-        print(f'Score is {score}')
+        return sum(count * score for count, score in zip(self.parsed, PART_2_SCORES))
 
-Day().execute()
+if __name__ == '__main__':
+    Day().execute()
@@ -1,41 +1,105 @@
+from functools import reduce
+from operator import or_
 import string
+from typing import TYPE_CHECKING
 from base import BaseDay
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+PRIORITIES = f' {string.ascii_lowercase}{string.ascii_uppercase}'
+
+# A rucksack's contents as a 53 bit mask, with bit p set for an item of priority p. Common items are then just `&`, and
+# the priority of the only one is `mask.bit_length() - 1`.
+ITEM_BITS = {letter: 1 << priority for priority, letter in enumerate(PRIORITIES) if priority}
+
+# Importing numpy takes longer than solving a normal sized input, so it's only used for inputs at least this big
+BATCH_MIN_BYTES = 1 << 20
+
+
+def item_mask(items: str) -> int:
+    return reduce(or_, map(ITEM_BITS.__getitem__, items), 0)
+
+
+def priority(mask: int) -> int:
+    "The priority of the only item in a mask"
+    return mask.bit_length() - 1
+
 
 class Day(BaseDay):
     day = 3
 
-    priorities = f' {string.ascii_lowercase}{string.ascii_uppercase}'
+    def use_batches(self) -> bool:
+        return self.data_path.stat().st_size >= BATCH_MIN_BYTES
 
     def part_1(self):
+        if self.use_batches():
+            first, second = self.batch_masks(halves=True)
+            return self.batch_priority_total(first & second)
+
         total = 0
-        for line in self.data_lines:
+        for line in self.iter_lines():
             if line == '':
                 continue
 
             half = len(line) // 2
-            first = line[:half]
-            second = line[half:]
-            common = set(first).intersection(set(second))
-            total += self.priorities.index(list(common)[0])
+            total += priority(item_mask(line[:half]) & item_mask(line[half:]))
 
-        print(total)
+        return total
 
     def part_2(self):
+        if self.use_batches():
+            masks = self.batch_masks()
+            return self.batch_priority_total(masks[0::3] & masks[1::3] & masks[2::3])
+
         total = 0
 
-        def _lines_by_chunk(lines: list[str]) -> tuple[str, str, str]:
-            n = 0
-            while n < (len(lines) - 1):
-                yield lines[n], lines[n + 1], lines[n + 2]
-                n += 3
+        lines = self.iter_lines()
+        for group in zip(lines, lines, lines):
+            common = item_mask(group[0]) & item_mask(group[1]) & item_mask(group[2])
+
+            assert common & (common - 1) == 0, "More than one item in common"
+            total += priority(common)
+
+        return total
+
+    def batch_masks(self, halves: bool = False) -> 'np.ndarray | tuple[np.ndarray, np.ndarray]':
+        """
+        The mask of every line (or with `halves`, a pair of arrays of the masks of their first and second halves),
+        worked out for the whole input at once
+        """
+        import numpy as np
+
+        data = self.data_path.read_bytes().rstrip(b'\n') + b'\n'
+        raw = np.frombuffer(data, np.uint8)
+
+        # A translate table from each byte to its item's bit, with newlines and anything else as 0
+        table = np.zeros(256, np.uint64)
+        for letter, bit in ITEM_BITS.items():
+            table[ord(letter)] = bit
+        bits = table[raw]
+
+        ends = np.flatnonzero(raw == ord('\n'))
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        if not halves:
+            return np.bitwise_or.reduceat(bits, starts)
+
+        # OR together the bits from each start to the middle of its line, and each middle to the next start
+        bounds = np.empty(2 * len(starts), np.int64)
+        bounds[0::2] = starts
+        bounds[1::2] = (starts + ends) // 2
+        masks = np.bitwise_or.reduceat(bits, bounds)
+        return masks[0::2], masks[1::2]
 
-        for group in _lines_by_chunk(self.data_lines):
-            result = set(group[0]).intersection(set(group[1])).intersection(set(group[2]))
+    @staticmethod
+    def batch_priority_total(common: 'np.ndarray') -> int:
+        "The total priority of an array of single item masks"
+        import numpy as np
 
-            assert len(result) == 1
-            total += self.priorities.index(list(result)[0])
-        
-        print(total)
+        # frexp gives 2^p as 0.5 * 2^(p + 1), exactly, so this is `bit_length() - 1` for every mask at once
+        _, exponents = np.frexp(common.astype(np.float64))
+        return int((exponents - 1).sum())
 
-Day().execute()
+if __name__ == '__main__':
+    Day().execute()
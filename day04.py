@@ -1,47 +1,61 @@
+from functools import cached_property
+from typing import TYPE_CHECKING, Union
 from base import BaseDay
 
+if TYPE_CHECKING:
+    import numpy as np
 
-class Day(BaseDay):
-    day = 4
 
-    def part_1(self):
-        total = 0
-        for line in self.data_lines:
-            if line == '':
-                continue
+SEPARATORS = bytes.maketrans(b',-', b'  ')
 
-            first, second = line.split(',')
-            a = self.range_to_tuple(first)
-            b = self.range_to_tuple(second)
 
-            if self.does_first_contain_second(a, b) or self.does_first_contain_second(b, a):
-                total += 1
+class IntervalIndex:
+    """
+    Answers "how many section ranges overlap [lo, hi]?" in O(log n), from the ranges' sorted endpoints.
 
-        print(total)
+    A range overlaps [lo, hi] unless it ends before `lo` or starts after `hi` (and no range can do both), so the answer
+    is the number that start at or before `hi`, less the number that end before `lo`.
+    """
+    def __init__(self, starts: 'np.ndarray', ends: 'np.ndarray'):
+        import numpy as np
 
-    def does_first_contain_second(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
-        return a[0] <= b[0] and a[1] >= b[1]
+        self.starts = np.sort(starts)
+        self.ends = np.sort(ends)
 
-    def does_overlap(self, a: tuple[int, int], b: tuple[int, int]) -> bool:
-        return (a[0] <= b[0] <= a[1]) or (a[0] <= b[1] <= a[1])
+    def count_overlapping(
+        self, lo: Union[int, 'np.ndarray'], hi: Union[int, 'np.ndarray']
+    ) -> Union[int, 'np.ndarray']:
+        "Takes ints for one query, or arrays of them to answer a whole batch at once"
+        import numpy as np
 
-    def range_to_tuple(self, val: str) -> tuple[int, int]:
-        a, b = val.split('-')
-        return int(a), int(b)
+        counts = np.searchsorted(self.starts, hi, 'right') - np.searchsorted(self.ends, lo, 'left')
+        return int(counts) if np.ndim(counts) == 0 else counts
 
-    def part_2(self):
-        total = 0
-        for line in self.data_lines:
-            if line == '':
-                continue
 
-            first, second = line.split(',')
-            a = self.range_to_tuple(first)
-            b = self.range_to_tuple(second)
+class Day(BaseDay):
+    day = 4
 
-            if self.does_first_contain_second(a, b) or self.does_first_contain_second(b, a) or self.does_overlap(a, b):
-                total += 1
+    def parse(self) -> 'np.ndarray':
+        "One row per pair of elves: first start, first end, second start, second end"
+        import numpy as np
 
-        print(total)
+        numbers = self.data_path.read_bytes().translate(SEPARATORS).split()
+        return np.array(numbers, dtype=np.int64).reshape(-1, 4)
+
+    @cached_property
+    def section_index(self) -> IntervalIndex:
+        "Every elf's range, for what-if queries"
+        return IntervalIndex(self.parsed[:, 0::2].ravel(), self.parsed[:, 1::2].ravel())
+
+    def part_1(self):
+        a_start, a_end, b_start, b_end = self.parsed.T
+        contains = ((a_start <= b_start) & (a_end >= b_end)) | ((b_start <= a_start) & (b_end >= a_end))
+        return int(contains.sum())
+
+    def part_2(self):
+        a_start, a_end, b_start, b_end = self.parsed.T
+        overlaps = (a_start <= b_end) & (b_start <= a_end)
+        return int(overlaps.sum())
 
-Day().execute()
+if __name__ == '__main__':
+    Day().execute()
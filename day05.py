@@ -1,57 +1,67 @@
+from typing import TypeAlias
 from base import BaseDay
 
 
-class Day(BaseDay):
-    day = 5
+# Count, source and target, with stacks numbered from 0. A plain tuple, as building millions of NamedTuples is slow.
+Move: TypeAlias = tuple[int, int, int]
 
-    def load_initial(self):
-        lines = self.data_lines[:8]
-        lines.reverse()
-        STACK_COUNT = 9
-        stacks = [list() for _ in range(STACK_COUNT)]
 
-        for line in lines:
-            for n in range(STACK_COUNT):
-                letter = line[(n * 4) + 1]
-                if letter != ' ':
-                    stacks[n].append(letter)
+class Day(BaseDay):
+    day = 5
 
-        self.stacks = stacks
+    def parse(self) -> tuple[list[str], list[Move]]:
+        "The starting stacks (each a string of crates, bottom first) and the moves"
+        header, _, instructions = self.data.partition('\n\n')
+        *rows, labels = header.split('\n')
+        rows.reverse()
 
-    def part_1(self):
-        self.load_initial()
-        
-        instructions = self.data_lines[10:]
-        for line in instructions:
-            if line == '':
-                continue
+        stacks = []
+        for n in range(len(labels.split())):
+            column = (n * 4) + 1
+            stacks.append(''.join(row[column] for row in rows if column < len(row) and row[column] != ' '))
 
-            _, a, _, b, _, c = line.split(' ')
-            n, start, end = int(a), int(b), int(c)
+        # Every instruction is "move N from A to B"
+        words = instructions.split()
+        moves = [
+            (count, source - 1, target - 1)
+            for count, source, target in zip(map(int, words[1::6]), map(int, words[3::6]), map(int, words[5::6]))
+        ]
+        return stacks, moves
 
-            for _ in range(n):
-                self.stacks[end - 1].append(self.stacks[start - 1].pop())
+    def top_crates(self, keep_order: bool) -> str:
+        """
+        The crate on top of each stack after all the moves, without moving any crates.
 
-        ends = [stk.pop() for stk in self.stacks]
-        print(''.join(ends))
+        Each top crate is followed backwards through the moves to where it started, as (stack, depth below the top).
+        The CrateMover 9000 moves crates one at a time, which reverses the order of the group; the 9001 (`keep_order`)
+        moves them all at once. Either way, the work is per stack per move, however many crates move.
+        """
+        stacks, moves = self.parsed
 
-    def part_2(self):
-        self.load_initial()
-        
-        instructions = self.data_lines[10:]
-        for line in instructions:
-            if line == '':
-                continue
+        heights = [len(stack) for stack in stacks]
+        for count, source, target in moves:
+            heights[source] -= count
+            heights[target] += count
 
-            _, a, _, b, _, c = line.split(' ')
-            n, start, end = int(a), int(b), int(c)
+        positions = [(stack, 0) for stack, height in enumerate(heights) if height]
+        for count, source, target in reversed(moves):
+            for idx, (stack, depth) in enumerate(positions):
+                if stack == target:
+                    if depth < count:
+                        # One of the crates this move put on top
+                        positions[idx] = (source, depth if keep_order else count - 1 - depth)
+                    else:
+                        positions[idx] = (stack, depth - count)
+                elif stack == source:
+                    positions[idx] = (stack, depth + count)
 
-            to_remove = self.stacks[start - 1][-n:]
-            del self.stacks[start - 1][-n:]
+        return ''.join(stacks[stack][-1 - depth] for stack, depth in positions)
 
-            self.stacks[end-1].extend(to_remove)
+    def part_1(self):
+        return self.top_crates(keep_order=False)
 
-        ends = [stk.pop() for stk in self.stacks]
-        print(''.join(ends))
+    def part_2(self):
+        return self.top_crates(keep_order=True)
 
-Day().execute()
+if __name__ == '__main__':
+    Day().execute()
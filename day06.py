@@ -1,24 +1,57 @@
+from typing import Iterable, Iterator, Optional
 from base import BaseDay
 
 
+CHUNK_SIZE = 1 << 20
+
+
+def find_markers(chunks: Iterable[bytes], sizes: Iterable[int]) -> dict[int, Optional[int]]:
+    """
+    For each window size, how many bytes have been read when the last `size` of them are first all different (None if
+    never), in one pass over the stream however many sizes are wanted.
+
+    Keeps where each byte value was last seen, and so where the longest run of distinct bytes ending at the current one
+    starts. That run is the same for every size, and a marker of any size up to its length ends here.
+    """
+    found: dict[int, Optional[int]] = dict.fromkeys(sizes)
+    pending = sorted(found, reverse=True)  # Smallest last, as it's always the next to be found
+    last_seen = [-1] * 256
+    run_start = 0
+    offset = 0  # Position of the first byte of the chunk in the whole stream
+
+    for chunk in chunks:
+        for idx, value in enumerate(chunk, offset):
+            if last_seen[value] >= run_start:
+                run_start = last_seen[value] + 1
+            last_seen[value] = idx
+
+            while pending and idx - run_start >= pending[-1] - 1:
+                found[pending.pop()] = idx + 1
+            if not pending:
+                return found
+
+        offset += len(chunk)
+
+    return found
+
+
 class Day(BaseDay):
     day = 6
 
+    def iter_chunks(self) -> Iterator[bytes]:
+        with self.data_path.open('rb') as f:
+            while chunk := f.read(CHUNK_SIZE):
+                yield chunk.rstrip(b'\n')  # The signal is one line, so only the last chunk has a newline
+
+    def parse(self) -> dict[int, Optional[int]]:
+        "Both parts' markers, from one pass over the input"
+        return find_markers(self.iter_chunks(), (4, 14))
+
     def part_1(self):
-        # msg = 'mjqjpqmgbljsphdztnvjfqwrcgsmlb'
-        msg = self.data_lines[0]
-        size = 4
-        for idx, letter in enumerate(msg):
-            if len(set(msg[idx:idx + size])) == size:
-                print(idx + size)
-                break
+        return self.parsed[4]
 
     def part_2(self):
-        msg = self.data_lines[0]
-        size = 14
-        for idx, letter in enumerate(msg):
-            if len(set(msg[idx:idx + size])) == size:
-                print(idx + size)
-                break
-
-Day().execute()
+        return self.parsed[14]
+
+if __name__ == '__main__':
+    Day().execute()
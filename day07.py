@@ -68,7 +68,7 @@ class Directory:
 class Day(BaseDay):
     day = 7
 
-    def load_filesystem(self) -> Directory:
+    def parse(self) -> Directory:
         root_dir: Directory = Directory('/', None, [], [], 0)
         current_dir = root_dir
 
@@ -95,25 +95,26 @@ class Day(BaseDay):
         return root_dir
 
     def part_1(self):
-        root_dir = self.load_filesystem()
+        root_dir = self.parsed
         total = 0
         for dir in root_dir.all_dirs():
             size = dir.size_recursive()
             if size < 100000:
                 total += size
 
-        print(total)
+        return total
 
     def part_2(self):
         TOTAL_SPACE = 70000000
         NEEDED_SPACE = 30000000
 
-        root_dir = self.load_filesystem()
+        root_dir = self.parsed
         free_space = TOTAL_SPACE - root_dir.size_recursive()
         gap = NEEDED_SPACE - free_space
         results = [(dir, dir.size_recursive()) for dir in root_dir.all_dirs()]
         results = [r for r in results if r[1] >= gap]
         results.sort(key=lambda r: r[1])
-        print(results[0][1])
+        return results[0][1]
 
-Day().execute()
+if __name__ == '__main__':
+    Day().execute()
@@ -1,82 +1,61 @@
-from dataclasses import dataclass
-from functools import cached_property
 import math
-from typing import Generator, NamedTuple
+from typing import Generator
 from base import BaseDay
+from grid import Grid
 
 
-class Coord(NamedTuple):
-    x: int
-    y: int
-
-
-@dataclass
-class Tree:
-    height: int
-    coord: Coord
-    visible: bool = False
-
-
-class Forest:
-    def __init__(self):
-        self.trees: dict[Coord, Tree] = {}
-
-    @cached_property
-    def max_coord(self) -> Coord:
-        return Coord(
-            max(coord.x for coord in self.trees.keys()),
-            max(coord.y for coord in self.trees.keys())
+class Forest(Grid):
+    "Tree heights"
+    def is_visible(self, index: int) -> bool:
+        height = self.cells[index]
+        return any(
+            not path or max(path) < height
+            for path in self.get_neighbours(index)
         )
 
-    def determine_visibility(self):
-        for tree in self.trees.values():
-            for path in self.get_neighbours(tree):
-                if not path or all(tree.height > other.height for other in path):
-                    tree.visible = True
-    
-    def get_neighbours(self, tree) -> Generator[list[Tree], None, None]:
+    def get_neighbours(self, index: int) -> Generator[bytearray, None, None]:
+        "The heights of the trees in each direction from a tree, nearest first"
+        x, _ = self.coord(index)
+        row_start = index - x
+
         # Left
-        yield [self.trees[Coord(x, tree.coord.y)] for x in range(tree.coord.x - 1, -1, -1)]
+        yield self.cells[row_start:index][::-1]
 
         # Right
-        yield [self.trees[Coord(x, tree.coord.y)] for x in range(tree.coord.x + 1, self.max_coord.x + 1)]
+        yield self.cells[index + 1:row_start + self.width]
 
         # Up
-        yield [self.trees[Coord(tree.coord.x, y)] for y in range(tree.coord.y - 1, -1, -1)]
+        yield self.cells[x:index:self.stride][::-1]
 
         # Down
-        yield [self.trees[Coord(tree.coord.x, y)] for y in range(tree.coord.y + 1, self.max_coord.y + 1)]
+        yield self.cells[index + self.stride::self.stride]
 
 
 class Day(BaseDay):
     day = 8
+    parse_version = 2
 
-    def load_forest(self) -> Forest:
-        forest = Forest()
-        for y, line in enumerate(self.data_lines):
-            for x, height in enumerate(line):
-                forest.trees[Coord(x, y)] = Tree(int(height), Coord(x, y))
-
-        return forest
+    def parse(self) -> Forest:
+        return Forest.from_lines(self.data_lines)
 
     def part_1(self):
-        forest = self.load_forest()
-        forest.determine_visibility()
+        forest = self.parsed
 
-        total = sum(1 for tree in forest.trees.values() if tree.visible)
-        print(f'Count is {total}')
+        total = sum(1 for index in forest.indexes() if forest.is_visible(index))
+        return total
 
     def part_2(self):
-        forest = self.load_forest()
+        forest = self.parsed
 
         max_score = 0
-        for tree in forest.trees.values():
+        for index in forest.indexes():
+            height = forest.cells[index]
             scores = []
-            for path in forest.get_neighbours(tree):
+            for path in forest.get_neighbours(index):
                 score = 0
                 for other in path:
                     score += 1
-                    if other.height >= tree.height:
+                    if other >= height:
                         break
 
                 scores.append(score)
@@ -85,6 +64,7 @@ class Day(BaseDay):
             if product > max_score:
                 max_score = product
 
-        print(max_score)
+        return max_score
 
-Day().execute()
+if __name__ == '__main__':
+    Day().execute()
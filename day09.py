@@ -55,7 +55,7 @@ class Day(BaseDay):
                 rope.move_head(direction, 1)
                 rope.move_tail()
 
-        print(len(rope.tail_history))
+        return len(rope.tail_history)
 
     def part_2(self):
         ropes = [Rope() for _ in range(9)]
@@ -74,6 +74,7 @@ class Day(BaseDay):
                     rope.head = ropes[idx - 1].tail
                     rope.move_tail()
 
-        print(len(ropes[-1].tail_history))
+        return len(ropes[-1].tail_history)
 
-Day().execute()
+if __name__ == '__main__':
+    Day().execute()
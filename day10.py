@@ -42,7 +42,7 @@ class Day(BaseDay):
 
     def part_1(self):
         cpu = Cpu()
-        for line in self.data_lines:
+        for line in self.iter_lines():
             match line.split():
                 case ["noop"]:
                     cpu.noop()
@@ -53,13 +53,13 @@ class Day(BaseDay):
         for counter in range(20, 221, 40):
             # print(f'{counter=} {cpu.history[counter]=} {counter * cpu.history[counter]}')
             total += counter * cpu.history[counter - 1]
-        print(total)
+        return total
 
     def part_2(self):
         cpu = Cpu()
         crt = Crt()
 
-        for line in self.data_lines:
+        for line in self.iter_lines():
             match line.split():
                 case ["noop"]:
                     cpu.noop()
@@ -69,7 +69,8 @@ class Day(BaseDay):
         for idx, x in enumerate(cpu.history):
             crt.draw_pixel(idx, x)
 
-        print(crt)
+        return str(crt)
 
-# Day('day_10_test.txt').execute()
-Day().execute()
+if __name__ == '__main__':
+    # Day('day_10_test.txt').execute()
+    Day().execute()
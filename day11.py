@@ -1,6 +1,10 @@
 from base import BaseDay
+from cycles import find_cycle
+import collections
+import itertools
 import operator
 import math
+from typing import Generator
 
 
 class Monkey:
@@ -86,22 +90,53 @@ class Day(BaseDay):
                 monkey.take_turn(monkeys)
 
         monkeys.sort(key=lambda m: m.inspection_count)
-        print(monkeys[-2].inspection_count * monkeys[-1].inspection_count)
+        return monkeys[-2].inspection_count * monkeys[-1].inspection_count
+
+    def item_rounds(
+        self, monkeys: list[Monkey], holder: int, item: int, gcd: int
+    ) -> Generator[tuple[tuple[int, int], tuple[int, ...]], None, None]:
+        """
+        Follow a single item round by round, yielding where it is and how many times each monkey has inspected it.
+        Without the divide by 3, items don't affect each other, so each can be followed (and its cycle found) alone.
+        """
+        counts = [0] * len(monkeys)
+
+        while True:
+            # Monkeys take turns in order, so an item thrown to a later monkey is inspected again this round
+            while True:
+                monkey = monkeys[holder]
+                counts[holder] += 1
+                item = monkey.apply_operation(item) % gcd
+                target = monkey.true_throw if monkey.apply_test(item) else monkey.false_throw
+                if target < holder:
+                    holder = target
+                    break
+                holder = target
+
+            yield (holder, item), tuple(counts)
 
     def part_2(self):
         monkeys = self.parse_monkeys()
         gcd = math.prod(m.test_div for m in monkeys)
-        print(f'{gcd=}')
-
-        for monkey in monkeys:
-            monkey.worry_divide = None
-
-        for _ in range(10000):
-            for monkey in monkeys:
-                monkey.reduce_gcd(gcd)
-                monkey.take_turn(monkeys)
-
-        monkeys.sort(key=lambda m: m.inspection_count)
-        print(monkeys[-2].inspection_count * monkeys[-1].inspection_count)
-
-Day().execute()
+        self.debug(f'{gcd=}')
+
+        rounds = 10000
+        inspection_counts = [0] * len(monkeys)
+        for holder, monkey in enumerate(monkeys):
+            for item in monkey.items:
+                cycle = find_cycle(itertools.islice(self.item_rounds(monkeys, holder, item, gcd), rounds))
+                if cycle is None:
+                    # Doesn't repeat soon enough to help, so just play out every round
+                    all_rounds = itertools.islice(self.item_rounds(monkeys, holder, item, gcd), rounds)
+                    last_round = collections.deque(all_rounds, maxlen=1)
+                    counts = last_round[0][1]
+                else:
+                    counts = cycle.value_after(rounds)
+
+                inspection_counts = [total + n for total, n in zip(inspection_counts, counts)]
+
+        inspection_counts.sort()
+        return inspection_counts[-2] * inspection_counts[-1]
+
+if __name__ == '__main__':
+    Day().execute()
@@ -1,87 +1,65 @@
-import contextlib
 import string
-from typing import NamedTuple
 from base import BaseDay
+from grid import Grid
+from search import SearchStats, bfs
 
-import networkx
 
+class HeightMap(Grid):
+    start = 0
+    end = 0
 
-class Coord(NamedTuple):
-    x: int
-    y: int
-
-
-class Grid:
-    def __init__(self):
-        self.coords: dict[Coord, int] = {}  # Coord : height
-        self.start = Coord(0, 0)
-        self.end = Coord(0, 0)
-
-    def moves_from_coord(self, coord: Coord) -> list[Coord]:
+    def moves_from_index(self, index: int) -> list[int]:
         # Find any neighbours which are a valid move
-        directions = [
-            [1, 0],
-            [-1, 0],
-            [0, 1],
-            [0, -1]
-        ]
-        neighbours = [Coord(coord.x + dx, coord.y + dy) for dx, dy in directions]
+        cells = self.cells
+        return [n for n in self.neighbours(index) if cells[n] <= (cells[index] + 1)]
 
-        return [n for n in neighbours if n in self.coords and self.coords[n] <= (self.coords[coord] + 1)]
+    def moves_to_index(self, index: int) -> list[int]:
+        # Find any neighbours which could move here
+        cells = self.cells
+        return [n for n in self.neighbours(index) if cells[index] <= (cells[n] + 1)]
 
 
 class Day(BaseDay):
     day = 12
+    parse_version = 3
 
-    def load_grid(self) -> Grid:
-        grid = Grid()
+    def parse(self) -> HeightMap:
+        heights = {letter: height for height, letter in enumerate(string.ascii_lowercase)}
+        heights.update(S=0, E=25)
+        grid = HeightMap.from_lines(self.data_lines, heights)
 
         for y, line in enumerate(self.data_lines):
-            for x, letter in enumerate(line):
-                if letter == 'S':
-                    height = 0
-                    grid.start = Coord(x, y)
-                elif letter == 'E':
-                    height = 25
-                    grid.end = Coord(x, y)
-                else:
-                    height = string.ascii_lowercase.index(letter)
-
-                grid.coords[Coord(x, y)] = height
+            if 'S' in line:
+                grid.start = grid.index(line.index('S'), y)
+            if 'E' in line:
+                grid.end = grid.index(line.index('E'), y)
 
         return grid
 
-    def load_graph(self, grid: Grid):
-        edges = []
-        for coord in grid.coords.keys():
-            edges.extend((coord, neighbour) for neighbour in grid.moves_from_coord(coord))
-
-        g = networkx.DiGraph()
-        for coord in grid.coords.keys():
-            g.add_node(coord)
-        
-        g.add_edges_from(edges)
-        return g
-
     def part_1(self):
-        grid = self.load_grid()
-        g = self.load_graph(grid)
+        grid = self.parsed
+        stats = SearchStats()
+
+        for steps, index in bfs([grid.start], grid.moves_from_index, stats=stats):
+            if index == grid.end:
+                self.debug(stats.summary())
+                return steps
 
-        print(networkx.shortest_path_length(g, source=grid.start, target=grid.end))
+        raise ValueError("No path")
 
     def part_2(self):
-        grid = self.load_grid()
-        g = self.load_graph(grid)
-        step_results = []
+        # Search backwards from the end, so the first lowest point found is the closest
+        grid = self.parsed
+        stats = SearchStats()
 
-        for coord, height in grid.coords.items():
-            if height == 0:
-                with contextlib.suppress(networkx.NetworkXNoPath):
-                    steps = networkx.shortest_path_length(g, source=coord, target=grid.end)
-                    step_results.append(steps)
+        for steps, index in bfs([grid.end], grid.moves_to_index, stats=stats):
+            if grid.cells[index] == 0:
+                self.debug(stats.summary())
+                return steps
 
-        print(min(step_results))
+        raise ValueError("No path")
 
 
-Day().execute()
-# Day('day_12_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day('day_12_test.txt').execute()
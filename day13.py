@@ -52,7 +52,7 @@ class Day(BaseDay):
                 # print(f'Pair {idx} is ordered')
                 total += idx + 1
 
-        print(total)
+        return total
 
     def is_ordered(self, pair: Pair) -> bool:
         try:
@@ -108,8 +108,9 @@ class Day(BaseDay):
         a_idx = values.index([[2]]) + 1
         b_idx = values.index([[6]]) + 1
 
-        print(a_idx * b_idx)
+        return a_idx * b_idx
 
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
@@ -1,7 +1,7 @@
 import contextlib
-from functools import cached_property
 from typing import NamedTuple
 from base import BaseDay
+from grid import Grid
 
 
 class Coord(NamedTuple):
@@ -13,10 +13,20 @@ class HaltException(Exception):
     pass
 
 
-class Grid:
-    def __init__(self):
-        self.coords: dict[Coord, str] = {}
+EMPTY, ROCK, SAND = 0, 1, 2
+
+
+class Cave(Grid):
+    "Just wide enough either side of the sand's source for the biggest possible pile, and deep enough for the floor"
+    source = Coord(500, 0)
+
+    def __init__(self, max_y: int):
+        self.max_y = max_y
+        height = max_y + 3
+        super().__init__(2 * height + 1, height, origin=(self.source.x - height, 0))
         self.sand_count = 0
+        # Sand at or past this index has fallen below all the rock
+        self.abyss = self.index(self.origin_x, max_y + 1)
 
     def add_path(self, pairs: list[tuple[Coord, Coord]]):
         for pair in pairs:
@@ -31,72 +41,53 @@ class Grid:
             # Fill path, inclusive
             for x in range(x_start, x_end + 1):
                 for y in range(y_start, y_end + 1):
-                    self.coords[Coord(x, y)] = '#'
-
-            self.coords[pair[0]] = '#'
-            self.coords[pair[1]] = '#'
-
-    @cached_property
-    def max_y(self):
-        return max(coord.y for coord in self.coords)
-
-    def is_empty(self, coord):
-        return coord not in self.coords
+                    self[x, y] = ROCK
 
     def add_sand(self) -> Coord:
-        position = Coord(500, 0)
+        cells, stride = self.cells, self.stride
+        start = position = self.index(*self.source)
 
         while True:
-            if position.y > (self.max_y + 10):
+            if position >= self.abyss:
                 # Sand is falling to infinity
                 raise HaltException()
 
-            next_down = Coord(position.x, position.y + 1)
-            if self.is_empty(next_down):
-                position = next_down
+            below = position + stride
+            if cells[below] == EMPTY:
+                position = below
                 continue
 
-            next_left = Coord(position.x - 1, position.y + 1)
-            if self.is_empty(next_left):
-                position = next_left
+            if cells[below - 1] == EMPTY:
+                position = below - 1
                 continue
 
-            next_right = Coord(position.x + 1, position.y + 1)
-            if self.is_empty(next_right):
-                position = next_right
+            if cells[below + 1] == EMPTY:
+                position = below + 1
                 continue
 
             # Nothing available. We've found a spot
-            if position == Coord(500, 0):
-                self.coords[position] = 'o'
-                self.sand_count += 1
-                raise HaltException()
-
             break
 
-        self.coords[position] = 'o'
+        cells[position] = SAND
         self.sand_count += 1
-        return position
+        if position == start:
+            raise HaltException()
 
-    def add_floor(self):
-        self.add_path([(Coord(-1000, self.max_y + 2), Coord(1000, self.max_y + 2))])
+        return Coord(*self.coord(position))
 
-    def output(self):
-        min_x = min(coord.x for coord in self.coords)
-        max_x = max(coord.x for coord in self.coords)
-        min_y = 0
-        max_y = self.max_y
+    def add_floor(self):
+        self.add_path([(Coord(self.origin_x, self.max_y + 2), Coord(self.origin_x + self.width - 1, self.max_y + 2))])
+        self.abyss = len(self.cells)
 
-        for y in range(min_y, max_y + 1):
-            line = [self.coords.get(Coord(x, y), '.') for x in range(min_x, max_x + 1)]
-            print(''.join(line))
+    def __str__(self) -> str:
+        return self.render('.#o')
 
 
 class Day(BaseDay):
     day = 14
 
-    def load_grid(self) -> Grid:
-        grid = Grid()
+    def parse(self) -> Cave:
+        paths = []
 
         for line in self.data_lines:
             coords = line.split(' -> ')
@@ -108,37 +99,39 @@ class Day(BaseDay):
                     coord_2x, coord_2y = coords[idx + 1].split(',')
                     pairs.append((Coord(int(coord_1x), int(coord_1y)), Coord(int(coord_2x), int(coord_2y))))
 
-            grid.add_path(pairs)
-        
-        return grid
+            paths.append(pairs)
+
+        cave = Cave(max(coord.y for pairs in paths for pair in pairs for coord in pair))
+        for pairs in paths:
+            cave.add_path(pairs)
+
+        return cave
 
     def part_1(self):
-        grid = self.load_grid()
-        grid.output()
+        grid = self.parsed.copy()
+        self.debug(grid, level=2)
 
         with contextlib.suppress(HaltException):
             while True:
                 grid.add_sand()
 
-        print()
-        grid.output()
+        self.debug(grid, level=2)
 
-        print(grid.sand_count)
+        return grid.sand_count
 
     def part_2(self):
-        grid = self.load_grid()
+        grid = self.parsed.copy()
         grid.add_floor()
-        # grid.output()
 
         with contextlib.suppress(HaltException):
             while True:
                 grid.add_sand()
 
-        # print()
-        # grid.output()
+        self.debug(grid, level=2)
 
-        print(grid.sand_count)
+        return grid.sand_count
 
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
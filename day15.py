@@ -3,7 +3,6 @@ from functools import cached_property, lru_cache
 import re
 from typing import Generator, NamedTuple
 from base import BaseDay
-from tqdm import tqdm
 
 
 class Coord(NamedTuple):
@@ -82,6 +81,7 @@ class Grid:
 
 class Day(BaseDay):
     day = 15
+    time_budgets = {1: 10.0, 2: 90.0}
 
     def load_grid(self) -> Grid:
         grid = Grid()
@@ -102,11 +102,12 @@ class Day(BaseDay):
         total = 0
         y = 2000000
         sensors = list(grid.sensors_intersecting_with_line(y))
-        for x in tqdm(range(grid.min_x, grid.max_x + 1), 'x'):
-            if grid.coord_is_not_beacon(Coord(x, y), sensors):
-                total += 1
+        with self.metrics('part 1') as metrics:
+            for x in metrics.counter('x').track(range(grid.min_x, grid.max_x + 1)):
+                if grid.coord_is_not_beacon(Coord(x, y), sensors):
+                    total += 1
 
-        print(total)
+        return total
 
     def part_2(self):
         grid = self.load_grid()
@@ -115,23 +116,31 @@ class Day(BaseDay):
         result = None
 
         # Search outline of each sensor
-        for sensor in tqdm(grid.sensors, 'sensor'):
-            if result is not None:
-                break
-
-            for idx, coord in enumerate(tqdm(sensor.just_outside_coords(), total=sensor.beacon_distance * 4)):
-                if coord.x < min_bounds or coord.x > max_bounds:
-                    continue
-                if coord.y < min_bounds or coord.y > max_bounds:
-                    continue
-
-                if not grid.coord_is_covered(coord):
-                    result = coord
+        with self.metrics('part 2') as metrics:
+            sensors = metrics.counter('sensors')
+            coords = metrics.counter('coords')
+
+            for sensor in sensors.track(grid.sensors):
+                if result is not None:
                     break
-    
-        print(f'{result=}')
-        print(result.x * max_bounds + result.y)
+
+                # Counted here and added once per sensor, as `coords.track` would add a generator step to every coord
+                checked = 0
+                for checked, coord in enumerate(sensor.just_outside_coords(), 1):
+                    if coord.x < min_bounds or coord.x > max_bounds:
+                        continue
+                    if coord.y < min_bounds or coord.y > max_bounds:
+                        continue
+
+                    if not grid.coord_is_covered(coord):
+                        result = coord
+                        break
+                coords.add(checked)
+
+        self.debug(f'{result=}')
+        return result.x * max_bounds + result.y
 
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
@@ -1,27 +1,14 @@
 import contextlib
 from collections import deque
 import itertools
-from tqdm import tqdm
 from functools import cached_property, lru_cache
 import re
-from typing import Generator, NamedTuple
+from typing import TYPE_CHECKING, Generator, NamedTuple
 from base import BaseDay
-import networkx
-import gc
+from search import SearchStats, dfs
 
-
-def setup_gc():
-    """
-    Suggested here: https://mkennedy.codes/posts/python-gc-settings-change-this-and-make-your-app-go-20pc-faster/
-
-    Seems to work well. It's important that it only happens once ever in the python process.
-    """
-    # gc.set_debug(gc.DEBUG_STATS)  # Enable to have each GC printed to the console
-    allocs, gen1, gen2 = gc.get_threshold()
-    allocs = 50_000  # Start the GC sequence every 50K not 700 allocations.
-    gen1 = gen1 * 2
-    gen2 = gen2 * 2
-    gc.set_threshold(allocs, gen1, gen2)
+if TYPE_CHECKING:
+    import networkx
 
 
 class Valve(NamedTuple):
@@ -98,9 +85,11 @@ def floyd(valves: list[Valve]) -> dict[tuple[str, str], int]:
 
 class Day(BaseDay):
     day = 16
+    runnable = False  # Superseded by DayV2
 
     minutes = 0
-    def make_graph(self) -> networkx.DiGraph:
+    def make_graph(self) -> 'networkx.DiGraph':
+        import networkx
         g = networkx.DiGraph()
         end = 'end'
 
@@ -213,6 +202,7 @@ class Day(BaseDay):
         )
 
     def part_1(self):
+        from tqdm import tqdm
         self.minutes = 31
         max_score = 0
         best = None
@@ -226,10 +216,11 @@ class Day(BaseDay):
                 games.set_description(f'Max is {max_score}')
 
         assert best is not None
-        print(best)
-        print(best.total_pressure)
+        self.debug(best)
+        return best.total_pressure
 
     def part_2(self):
+        from tqdm import tqdm
         self.minutes = 27
         games = list(self.generate_games())
 
@@ -237,9 +228,8 @@ class Day(BaseDay):
         for g1, g2 in tqdm(itertools.product(games, games)):
             count += 1
 
-        print(count)
-
-        print(len(games))
+        self.debug(count)
+        self.debug(len(games))
 
 
 class GameStateV2(NamedTuple):
@@ -250,6 +240,8 @@ class GameStateV2(NamedTuple):
 
 class DayV2(BaseDay):
     day = 16
+    parse_version = 1
+    time_budgets = {1: 10.0, 2: None}  # Part 2 compares every pair of routes, which takes hours on the full input
 
     initial_time_left = 0
 
@@ -257,13 +249,13 @@ class DayV2(BaseDay):
         self.initial_time_left = 30
         max_score = 0
 
-        games = tqdm(self.generate_games())
-        for game in games:
-            score = self.determine_score(game.open_valves)
-            if score > max_score:
-                max_score = score
-                games.set_description(str(max_score))
-        print(max_score)
+        with self.metrics('part 1') as metrics:
+            for game in metrics.counter('games').track(self.generate_games()):
+                score = self.determine_score(game.open_valves)
+                if score > max_score:
+                    max_score = score
+                    metrics.note('best', max_score)
+        return max_score
 
     def part_2(self):
         self.initial_time_left = 26
@@ -273,18 +265,31 @@ class DayV2(BaseDay):
 
         games.sort(key=lambda g: self.determine_score(g.open_valves), reverse=True)
 
-        game_iter = tqdm(games)
-        for g1 in game_iter:
-            for g2 in games:
-                score = self.determine_score_p2(g1.open_valves, g2.open_valves)
-                if score > max_score:
-                    max_score = score
-                    game_iter.set_description(str(max_score))
-
-        print(max_score)
-
-    @cached_property
-    def valves(self) -> dict[str, Valve]:
+        # The games are quick to generate again, so only where the outer loop had got to is saved
+        checkpoint = self.checkpoint('part 2')
+        start = 0
+        if saved := checkpoint.load():
+            start, max_score = saved.state
+            self.debug(f'Resuming at game {start} of {len(games)}, best so far {max_score}')
+
+        with self.metrics('part 2') as metrics:
+            pairs = metrics.counter('pairs')
+            for i, g1 in enumerate(games[start:], start):
+                if checkpoint.due():
+                    checkpoint.save((i, max_score))
+
+                for g2 in games:
+                    score = self.determine_score_p2(g1.open_valves, g2.open_valves)
+                    if score > max_score:
+                        max_score = score
+                        metrics.note('best', max_score)
+                pairs.add(len(games))
+
+        checkpoint.clear()
+        self.debug(checkpoint.summary())
+        return max_score
+
+    def parse(self) -> dict[str, Valve]:
         output = {}
 
         for line in self.data_lines:
@@ -293,6 +298,10 @@ class DayV2(BaseDay):
 
         return output
 
+    @cached_property
+    def valves(self) -> dict[str, Valve]:
+        return self.parsed
+
     @cached_property
     def non_zero_valves(self) -> list[Valve]:
         return [v for v in self.valves.values() if v.flow_rate > 0]
@@ -303,20 +312,19 @@ class DayV2(BaseDay):
 
     def generate_games(self) -> Generator[GameStateV2, None, None]:
         initial_state = GameStateV2(self.valves['AA'], self.initial_time_left, tuple())
+        stats = SearchStats()
 
-        dfs_stack: list[GameStateV2] = []
-        dfs_stack.extend(self.next_moves(initial_state))
-
-        while dfs_stack:
-            state = dfs_stack.pop()
-
+        # Every path is different, so there's nothing to deduplicate
+        for _, state in dfs([initial_state], self.next_moves, key=None, stats=stats):
             if state.time_left == 0:
                 yield state
-                continue
 
-            dfs_stack.extend(self.next_moves(state))
+        self.debug(stats.summary())
 
     def next_moves(self, state: GameStateV2) -> Generator[GameStateV2, None, None]:
+        if state.time_left == 0:
+            return
+
         # Find candidate valves to open next
         candidates = [
             v for v in self.non_zero_valves
@@ -398,10 +406,9 @@ class DayV2(BaseDay):
 
         return cumulative_pressure
 
-setup_gc()
-
-DayV2().execute()
-# DayV2(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    DayV2().execute()
+    # DayV2(f'day_{Day.day}_test.txt').execute()
 
 # 1763 too low
 # 1766 too low
@@ -1,7 +1,9 @@
 from dataclasses import dataclass
+import itertools
 from typing import Generator, NamedTuple
 from base import BaseDay
-from tqdm import tqdm
+from coords import offset2, pack2
+from cycles import find_cycle
 
 
 class Coord(NamedTuple):
@@ -24,73 +26,70 @@ rock_types = [
 ]
 
 
+# Shape pixels as packed offsets from the top left, with y increasing upwards
+rock_offsets = {
+    rock_type: tuple(offset2(coord.x, -coord.y) for coord in rock_type.coords) for rock_type in rock_types
+}
+
+
 @dataclass
 class Rock:
     tl_position: Coord
     height: int
     width: int
-    shape: tuple[Coord, ...]
+    shape: tuple[int, ...]  # Packed offsets
     stopped = False
 
-    def occupied_coords(self, pos: Coord) -> Generator[Coord, None, None]:
-        for coord in self.shape:
-            yield Coord(pos.x + coord.x, pos.y - coord.y)
+    def occupied_coords(self, pos: Coord) -> list[int]:
+        "Packed coordinates covered by the rock with its top left at `pos`"
+        packed = pack2(*pos)
+        return [packed + offset for offset in self.shape]
 
-    def move(self, gas: str, blocked_coords: set[Coord]):
-        dy = -1
-        dx = -1 if gas == '<' else 1
+    def collides(self, pos: Coord, blocked_coords: set[int]) -> bool:
+        packed = pack2(*pos)
+        return any((packed + offset) in blocked_coords for offset in self.shape)
 
-        # Left/right first
-        new_x_pos = Coord(self.tl_position.x + dx, self.tl_position.y)
-
-        # Check for collision with wall
-        if new_x_pos.x < 0 or (new_x_pos.x + self.width) > 7:
-            # No move
-            new_x_pos = self.tl_position
-        elif set(self.occupied_coords(new_x_pos)) & blocked_coords:
-            # Blocked by another rock, no move
-            new_x_pos = self.tl_position
+    def move(self, gas: str, blocked_coords: set[int]):
+        x, y = self.tl_position
+        dx = -1 if gas == '<' else 1
 
-        # Move down
-        new_y_pos = Coord(new_x_pos.x, new_x_pos.y + dy)
+        # Left/right first, unless it hits a wall or another rock
+        if 0 <= x + dx and (x + dx + self.width) <= 7 and not self.collides(Coord(x + dx, y), blocked_coords):
+            x += dx
 
-        # Check if collision with existing rocks
-        if (new_y_pos.y - self.height) < -1:
-            # Hit floor
-            new_y_pos = new_x_pos
-            self.stopped = True
-        if set(self.occupied_coords(new_y_pos)) & blocked_coords:
-            new_y_pos = new_x_pos
+        # Move down, unless it hits the floor or another rock
+        if (y - 1 - self.height) < -1 or self.collides(Coord(x, y - 1), blocked_coords):
             self.stopped = True
+        else:
+            y -= 1
 
-        self.tl_position = new_y_pos
+        self.tl_position = Coord(x, y)
 
 
 class Tunnel:
     width = 7
     
     def __init__(self):
-        self.blocked_coords: set[Coord] = set()
+        self.blocked_coords: set[int] = set()  # Packed
         self.max_height = 0
         self.height_offset = 0
 
     def add_rock(self, rock_type: RockType, gases: Generator[str, None, None]):
         rock = Rock(
             Coord(2, self.max_height + 3 + (rock_type.height - 1)),
-            rock_type.height, rock_type.width, rock_type.coords
+            rock_type.height, rock_type.width, rock_offsets[rock_type]
         )
 
         while not rock.stopped:
             rock.move(next(gases), self.blocked_coords)
 
-        occupied = set(rock.occupied_coords(rock.tl_position))
-        self.blocked_coords |= occupied
+        self.blocked_coords.update(rock.occupied_coords(rock.tl_position))
 
         self.max_height = max(self.max_height, rock.tl_position.y + 1)
 
     def __str__(self) -> str:
         lines = [
-            '|' + ''.join('#' if Coord(x, y) in self.blocked_coords else '.'  for x in range(self.width)) + '|'
+            '|' + ''.join('#' if pack2(x, y) in self.blocked_coords else '.'  for x in range(self.width)) + '|'
             for y in range(self.max_height + 2, -1, -1)
         ]
         lines += ['-' * 9]
@@ -101,35 +100,37 @@ class Tunnel:
     def collapse(self) -> int:
         # Find a horizontal line where no pieces could possible get through, and treat that as the new floor
         for y in range(self.max_height, -1, -1):
-            if {Coord(x, y) for x in range(self.width)}.issubset(self.blocked_coords):
+            if all(pack2(x, y) in self.blocked_coords for x in range(self.width)):
                 # y will be the new floor
                 self.height_offset += y
 
                 # Translate all higher coords
-                self.blocked_coords = {Coord(coord.x, coord.y - y) for coord in self.blocked_coords if coord.y >= y}
+                floor = pack2(0, y)
+                shift = offset2(0, y)
+                self.blocked_coords = {coord - shift for coord in self.blocked_coords if coord >= floor}
                 self.max_height -= y
                 return y
 
         raise ValueError("No collapse possible")
     
-    def print_whole_rows(self):
-        prev_match = 0
-        for y in range(0, self.max_height):
-            if {Coord(x, y) for x in range(self.width)}.issubset(self.blocked_coords):
-                print(f'{y - prev_match}    {y=}')
-                prev_match = y
-
-    def peek_top(self, n: int) -> set[Coord]:
-        # Top n rows, translated so the bottom row is y=0
-        return {Coord(coord.x, coord.y - (self.max_height - n)) for coord in self.blocked_coords if coord.y >= (self.max_height - n)}
+    def peek_top(self, n: int) -> set[int]:
+        # Top n rows, translated so the bottom row is y=0.
+        # With x >= 0, packed coords sort by row, so the row test is one comparison.
+        bottom = pack2(0, self.max_height - n)
+        shift = offset2(0, self.max_height - n)
+        return {coord - shift for coord in self.blocked_coords if coord >= bottom}
 
 
 class Day(BaseDay):
     day = 17
 
+    gas_index = 0
+
     def gas_generator(self) -> Generator[str, None, None]:
+        "Yields each jet in turn, keeping track of where it is in the pattern"
         while True:
-            yield from self.data_lines[0]
+            for self.gas_index, gas in enumerate(self.data_lines[0]):
+                yield gas
 
     def rock_type_generator(self) -> Generator[RockType, None, None]:
         while True:
@@ -140,56 +141,37 @@ class Day(BaseDay):
         rocks = self.rock_type_generator()
         gases = self.gas_generator()
 
-        for _ in range(600):
+        for _ in range(2022):
             tunnel.add_rock(next(rocks), gases)
 
-        # print(tunnel)
-        print(tunnel.max_height)
-
-    def part_2(self):
-        self.setup_gc()
-        print(flush=True)
+        self.debug(tunnel, level=2)
+        return tunnel.max_height
 
-        found = None
+    def drop_rocks(self, peek_size: int) -> Generator[tuple[tuple | None, int], None, None]:
+        "Fingerprint and height after each rock, for cycle detection"
         tunnel = Tunnel()
         rocks = self.rock_type_generator()
         gases = self.gas_generator()
-        peek_size = 50
-        states: dict[frozenset[Coord], tuple[int, int]] = {}
-        for loop_start in range(5000):
-            tunnel.add_rock(next(rocks), gases)
-
-            peek = frozenset(tunnel.peek_top(peek_size))
 
-            if peek in states:
-                # We found a match!
-                found = loop_start, states[peek][0], tunnel.max_height - states[peek][1]
-                break
+        for n in itertools.count():
+            tunnel.add_rock(next(rocks), gases)
 
+            fingerprint = None
             if tunnel.max_height > peek_size:
-                states[peek] = loop_start, tunnel.max_height
-        
-        assert found is not None
-        print(f'Cycle starts at {found[0]} and repeats every {found[0] - found[1]} and adds {found[2]}')
-        cycle_start = found[0]
-        cycle_period = found[0] - found[1]
-        cycle_height = found[2]
+                # The next rock and jet, and the shape of the top of the tower, decide everything from here on
+                fingerprint = (n % len(rock_types), self.gas_index, frozenset(tunnel.peek_top(peek_size)))
 
-        tunnel = Tunnel()
-        rocks = self.rock_type_generator()
-        gases = self.gas_generator()
-        cycles = 1000000000000
+            yield fingerprint, tunnel.max_height
 
-        for _ in range(cycle_start):
-            tunnel.add_rock(next(rocks), gases)
-        cycles -= cycle_start
+    def part_2(self):
+        cycle = find_cycle(self.drop_rocks(peek_size=50))
+        assert cycle is not None
 
-        divisor, remainder = divmod(cycles, cycle_period)
-        for _ in range(remainder):
-            tunnel.add_rock(next(rocks), gases)
-        print(f'Answer is {tunnel.max_height + cycle_height * divisor}')
+        self.debug(f'Cycle starts after {cycle.start} rocks and repeats every {cycle.period}, adding {cycle.delta}')
+        return cycle.value_after(1000000000000)
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 # 3116 no
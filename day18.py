@@ -1,17 +1,11 @@
-from typing import NamedTuple
 from base import BaseDay
-
-
-class Coord(NamedTuple):
-    x: int
-    y: int
-    z: int
+from coords import NEIGHBOURS_3D, bounds3, pack3, unpack3
 
 
 class Grid:
     def __init__(self):
-        self.coords: set[Coord] = set()
-        self.air: set[Coord] = set()
+        self.coords: set[int] = set()  # Packed
+        self.air: set[int] = set()
 
 
 class Day(BaseDay):
@@ -20,44 +14,30 @@ class Day(BaseDay):
     def load_grid(self) -> Grid:
         grid = Grid()
 
-        for line in self.data_lines:
+        for line in self.iter_lines():
             x, y, z = line.split(',')
-            grid.coords.add(Coord(int(x), int(y), int(z)))
+            grid.coords.add(pack3(int(x), int(y), int(z)))
 
         return grid
 
     def part_1(self):
         grid = self.load_grid()
         total_exposed = 0
-        directions = (
-            (0, 0, 1), (0, 0, -1),
-            (0, 1, 0), (0, -1, 0),
-            (1, 0, 0), (-1, 0, 0)
-        )
         for coord in grid.coords:
-            for dx, dy, dz in directions:
-                if Coord(coord.x + dx, coord.y + dy, coord.z + dz) not in grid.coords:
+            for offset in NEIGHBOURS_3D:
+                if coord + offset not in grid.coords:
                     total_exposed += 1
 
-        print(total_exposed)
+        return total_exposed
 
     def fill_air(self, grid: Grid):
         # Start from an edge (which isn't occupied!) and flood in every direction
         # until hitting a coordinate or edge
-        bounds = [
-            max(coord.x for coord in grid.coords) + 2,
-            max(coord.y for coord in grid.coords) + 2,
-            max(coord.z for coord in grid.coords) + 2,
-        ]
+        _, (max_x, max_y, max_z) = bounds3(grid.coords)
 
-        start = Coord(-1, -1, -1)
+        start = pack3(-1, -1, -1)
         assert start not in grid.coords
-        directions = (
-            (0, 0, 1), (0, 0, -1),
-            (0, 1, 0), (0, -1, 0),
-            (1, 0, 0), (-1, 0, 0)
-        )
-        stack: list[Coord] = [start]
+        stack: list[int] = [start]
 
         while stack:
             coord = stack.pop()
@@ -72,31 +52,30 @@ class Day(BaseDay):
 
             grid.air.add(coord)
 
-            for dx, dy, dz in directions:
-                new_coord = Coord(coord.x + dx, coord.y + dy, coord.z + dz)
-                if all(n >= -1 and n <= bounds[idx] for idx, n in enumerate(new_coord)):
-                    stack.append(new_coord)
+            # Stay within one step of the cubes on every side
+            x, y, z = unpack3(coord)
+            for offset, inside in zip(NEIGHBOURS_3D, (
+                z <= max_z + 1, z >= 0,
+                y <= max_y + 1, y >= 0,
+                x <= max_x + 1, x >= 0,
+            )):
+                if inside:
+                    stack.append(coord + offset)
 
     def part_2(self):
         grid = self.load_grid()
         total_exposed = 0
-        directions = (
-            (0, 0, 1), (0, 0, -1),
-            (0, 1, 0), (0, -1, 0),
-            (1, 0, 0), (-1, 0, 0)
-        )
         self.fill_air(grid)
         for coord in grid.coords:
-            for dx, dy, dz in directions:
-                c = Coord(coord.x + dx, coord.y + dy, coord.z + dz)
-                if c in grid.air:
+            for offset in NEIGHBOURS_3D:
+                if coord + offset in grid.air:
                     total_exposed += 1
 
-        print(total_exposed)
-        grid = self.load_grid()
+        return total_exposed
 
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 # 2071 too low
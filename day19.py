@@ -1,12 +1,11 @@
 import contextlib
-from dataclasses import dataclass, field
 from functools import lru_cache
 import math
-from queue import PriorityQueue
 import re
 from typing import Generator, NamedTuple, TypeAlias
 from base import BaseDay
-from tqdm import tqdm
+from checkpoint import Checkpoint
+from search import SearchStats, Snapshot, best_first, dfs, pack
 
 
 Robots: TypeAlias = tuple[int, int, int, int]
@@ -27,12 +26,6 @@ class State(NamedTuple):
     robots: Robots
 
 
-@dataclass(order=True, slots=True)
-class PriorityState:
-    priority: int
-    state: State = field(compare=False)
-
-
 ORE, CLAY, OBS, GEO = 0, 1, 2, 3
 TYPE_COUNT = 4
  
@@ -66,49 +59,48 @@ class Simulation:
             (blueprint.geode_robot_cost[0], 0, blueprint.geode_robot_cost[1], 0)
         )
         self.max_build_costs: Resources = tuple(max(robot[idx] for robot in self.robot_costs) for idx in range(4))
+        self.max_geodes = 0
+        self.stats = SearchStats()
 
-    def generate_end_states_dfs(self) -> Generator[State, None, None]:
-        initial_state = State(self.minutes, (0, 0, 0, 0), (1, 0, 0, 0))
+    @staticmethod
+    def state_key(state: State) -> int:
+        return pack((state.minutes_left, *state.resources, *state.robots))
 
-        stack: list[State] = [initial_state]
-        seen: set[State] = set()
+    def geode_bound(self, state: State) -> int:
+        "Most geodes a state could end up with: as if a new geode robot could be built every remaining minute"
+        t = state.minutes_left
+        return state.resources[GEO] + state.robots[GEO] * t + t * (t - 1) // 2
 
-        while stack:
-            state = stack.pop()
-            if state in seen:
-                continue
+    def cannot_improve(self, state: State) -> bool:
+        return self.geode_bound(state) <= self.max_geodes
 
-            if state.minutes_left == 0:
-                yield state
-                continue
+    def expand(self, state: State) -> Generator[State, None, None]:
+        if state.minutes_left:
+            yield from self.next_states(state)
 
-            seen.add(state)
+    def generate_end_states_dfs(
+        self, resume: Snapshot | None = None, checkpoint: Checkpoint | None = None
+    ) -> Generator[State, None, None]:
+        "End states, skipping any that can't beat the best found so far"
+        initial_state = State(self.minutes, (0, 0, 0, 0), (1, 0, 0, 0))
 
-            for new_state in self.next_states(state):
-                stack.append(new_state)
+        for _, state in dfs(
+            [initial_state], self.expand, self.state_key, self.cannot_improve, self.stats, resume, checkpoint
+        ):
+            if state.minutes_left == 0:
+                self.max_geodes = max(self.max_geodes, state.resources[GEO])
+                yield state
 
     def generate_end_states(self) -> Generator[State, None, None]:
+        "As above, but always exploring the state with the most geodes so far first"
         initial_state = State(self.minutes, (0, 0, 0, 0), (1, 0, 0, 0))
 
-        stack: PriorityQueue[PriorityState] = PriorityQueue()
-        stack.put(PriorityState(0, initial_state))
-
-        # seen: set[State] = set()
-
-        while stack:
-            state = stack.get().state
-            stack.task_done()
-            # if state in seen:
-            #     continue
-
+        for _, state in best_first(
+            [initial_state], self.expand, lambda s: -s.resources[GEO], self.state_key, self.cannot_improve, self.stats
+        ):
             if state.minutes_left == 0:
+                self.max_geodes = max(self.max_geodes, state.resources[GEO])
                 yield state
-                continue
-
-            # seen.add(state)
-
-            for new_state in self.next_states(state):
-                stack.put(PriorityState(-1 * new_state.resources[GEO], new_state))
 
     def next_states(self, state: State) -> Generator[State, None, None]:
         "Generate possible next states based on picking what to build next"
@@ -152,6 +144,8 @@ class Simulation:
 
 class Day(BaseDay):
     day = 19
+    parse_version = 1
+    time_budgets = {1: 15.0, 2: 60.0}
 
     def load_blueprints(self) -> Generator[Blueprint, None, None]:
         for line in self.data_lines:
@@ -161,48 +155,58 @@ class Day(BaseDay):
                 (int(obs_1), int(obs_2)), (int(geo_1), int(geo_2))
             )
 
-    def part_1(self):
-        results = []
-        for bp in tqdm(self.load_blueprints()):
-            sim = Simulation(bp, 24)
-            max_geode = 0
-            n_since_max = 0
-            state_iter = sim.generate_end_states_dfs()
-            for state in state_iter:
-                if state.resources[GEO] > max_geode:
-                    max_geode = state.resources[GEO]
-                    n_since_max = 0
-                else:
-                    n_since_max += 1
-
-                if n_since_max > 100000:
-                    break
-
-            # print(f'BP {bp.id} has geode count {max_geode}')
-            results.append(max_geode)
-
-        print(results)
-        print(sum((idx + 1) * n for idx, n in enumerate(results)))
+    def parse(self) -> list[Blueprint]:
+        return list(self.load_blueprints())
 
-    def part_2(self):
+    def part_1(self):
         results = []
-        blueprints = list(self.load_blueprints())
-        for bp in blueprints[:3]:
-            sim = Simulation(bp, 32)
-            max_geode = 0
-            state_iter = tqdm(sim.generate_end_states_dfs())
-            for state in state_iter:
-                if state.resources[GEO] > max_geode:
-                    max_geode = state.resources[GEO]
+        with self.metrics('part 1') as metrics:
+            blueprints = metrics.counter('blueprints')
+            states = metrics.counter('states')
+            for bp in blueprints.track(self.parsed):
+                sim = Simulation(bp, 24)
+                for _ in sim.generate_end_states_dfs():
+                    pass
+                states.add(sim.stats.expanded)
 
-            # print(f'BP {bp.id} has geode count {max_geode}')
-            results.append(max_geode)
+                self.debug(f'BP {bp.id} has geode count {sim.max_geodes} ({sim.stats.summary()})')
+                results.append(sim.max_geodes)
 
-        print(results)
-        print(results[0] * results[1] * results[2])
+        self.debug(results)
+        return sum((idx + 1) * n for idx, n in enumerate(results))
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+    def part_2(self):
+        # Saved with the search: the geode counts of the blueprints already done, and the best so far in this one
+        checkpoint = self.checkpoint('part 2', lambda: (results, sim.max_geodes))
+        results, max_geodes, snapshot = [], 0, None
+        if saved := checkpoint.load():
+            (results, max_geodes), snapshot = saved
+            self.debug(f'Resuming at blueprint {len(results) + 1}, with {len(snapshot.pending)} states to go')
+
+        blueprints = self.parsed
+        for bp in blueprints[len(results):3]:
+            sim = Simulation(bp, 32)
+            if snapshot is not None:
+                sim.max_geodes = max_geodes
+
+            with self.metrics(f'part 2 blueprint {bp.id}') as metrics:
+                metrics.gauge('states', lambda: sim.stats.expanded)
+                for _ in sim.generate_end_states_dfs(snapshot, checkpoint):
+                    pass
+                metrics.note('geodes', sim.max_geodes)
+
+            self.debug(f'BP {bp.id} has geode count {sim.max_geodes} ({sim.stats.summary()})')
+            results.append(sim.max_geodes)
+            snapshot = None
+
+        checkpoint.clear()
+        self.debug(checkpoint.summary())
+        self.debug(results)
+        return math.prod(results)  # The test input has only two blueprints
+
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 
 # 1352 too low
\ No newline at end of file
@@ -13,9 +13,10 @@ class ListEntry:
 
 class Day(BaseDay):
     day = 20
+    time_budgets = {1: 10.0, 2: 60.0}
 
     def construct_ll(self) -> list[ListEntry]:
-        numbers = [int(line) for line in self.data_lines]
+        numbers = [int(line) for line in self.iter_lines()]
         list_entries = [ListEntry(n, None, None) for n in numbers]   # type: ignore
 
         # Connect them all up
@@ -98,8 +99,8 @@ class Day(BaseDay):
             if n % 1000 == 0:
                 values.append(entry.value)
 
-        print(values)
-        print(sum(values))
+        self.debug(values)
+        return sum(values)
 
     def part_2(self):
         entries = self.construct_ll()
@@ -123,12 +124,13 @@ class Day(BaseDay):
             if n % 1000 == 0:
                 values.append(entry.value)
 
-        print(values)
-        print(sum(values))
+        self.debug(values)
+        return sum(values)
 
         
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 # [0, 4566000574778, -6646915163070, -4674753521280]  -6755668109572    - no
@@ -1,6 +1,5 @@
 import operator
 from base import BaseDay
-from tqdm import tqdm
 
 
 class Day(BaseDay):
@@ -47,7 +46,7 @@ class Day(BaseDay):
 
         self.solve(known, unknown)
 
-        print(known['root'])
+        return known['root']
 
     def part_2(self):
         known, unknown = self.parse_lines()
@@ -65,7 +64,7 @@ class Day(BaseDay):
         target = known[known_key]
         target_key = unknown_key
         known[unknown_key] = target  # There is now an overlap between known/unknown
-        print(f'Target is {target}')
+        self.debug(f'Target is {target}')
 
         # Work backwards
         while True:
@@ -112,12 +111,12 @@ class Day(BaseDay):
                 try:
                     del unknown[key]
                 except KeyError:
-                    print(f"Couldn't delete key {key}")
+                    self.debug(f"Couldn't delete key {key}")
                 
                 # self.solve(known, unknown)
 
         answer = known['humn']
-        print(f'humn should be {known["humn"]}')
+        self.debug(f'humn should be {known["humn"]}')
 
         # Verify
         known, unknown = self.parse_lines()
@@ -126,11 +125,14 @@ class Day(BaseDay):
         del unknown['root']
         self.solve(known, unknown)
 
-        print(f'Roots were {known[root_1]} and {known[root_2]}')
+        self.debug(f'Roots were {known[root_1]} and {known[root_2]}')
 
+        return int(answer)
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 
 # ans = a + x  =>  x = ans - a
@@ -1,6 +1,7 @@
 import re
 from typing import Literal, NamedTuple, NewType
 from base import BaseDay
+from grid import Grid
 
 
 X = NewType('X', int)
@@ -12,12 +13,22 @@ class Coord(NamedTuple):
     y: Y
 
 
-class Grid:
-    def __init__(self, coords: dict[Coord, bool]):
-        self.coords: dict[Coord, bool] = coords  # True = empty, False = blocked
+VOID, OPEN, WALL = 0, 1, 2
 
-        self.max_x = max(coord.x for coord in coords)
-        self.max_y = max(coord.y for coord in coords)
+
+class Board(Grid):
+    "Coordinates start at 1, with a border of void all round"
+    def __init__(self, lines: list[str]):
+        self.max_x = X(max(len(line) for line in lines))
+        self.max_y = Y(len(lines))
+        super().__init__(self.max_x + 1, self.max_y + 1, VOID, pad=1)
+
+        coords = []
+        for y, line in enumerate(lines, 1):
+            for x, letter in enumerate(line, 1):
+                if letter != ' ':
+                    self[x, y] = OPEN if letter == '.' else WALL
+                    coords.append(Coord(X(x), Y(y)))
 
         # For each y value, the min/max x
         self.y_bounds: list[list[X]] = [[X(1000000), X(0)] for _ in range(self.max_y + 2)]
@@ -25,7 +36,7 @@ class Grid:
         # For each x value, the min/max y
         self.x_bounds: list[list[Y]] = [[Y(1000000), Y(0)] for _ in range(self.max_x + 2)]
 
-        for coord in self.coords:
+        for coord in coords:
             if coord.x < self.y_bounds[coord.y][0]:
                 self.y_bounds[coord.y][0] = coord.x
             if coord.x > self.y_bounds[coord.y][1]:
@@ -45,7 +56,7 @@ class Turtle:
     }
     dir_rotations = 'urdl'  # for turning right
 
-    def __init__(self, grid: Grid, start_pos: Coord, start_dir = 'r'):
+    def __init__(self, grid: Board, start_pos: Coord, start_dir = 'r'):
         self.grid = grid
         self.pos = start_pos
         self.dir = start_dir
@@ -62,18 +73,18 @@ class Turtle:
             peek = Coord(self.pos.x + dx, self.pos.y + dy)
             new_facing = self.dir
 
-            if peek not in self.grid.coords:
+            if self.grid[peek] == VOID:
                 peek, new_facing = self.resolve_wrap(peek, dx, dy)
 
-            value = self.grid.coords.get(peek)
+            value = self.grid[peek]
 
-            if value == True:
+            if value == OPEN:
                 self.pos = peek
                 self.dir = new_facing
                 self.velo = self.dir_velo[new_facing]
                 continue
 
-            if value == False:
+            if value == WALL:
                 # Blocked, stop
                 return
 
@@ -94,7 +105,7 @@ class Turtle3D(Turtle):
 
     def resolve_wrap(self, peek: Coord, dx: int, dy: int) -> tuple[Coord, str]:
         if self.grid.max_x < 150:
-            raise ValueError("Only implemented for the full data shape")
+            raise NotImplementedError("Only implemented for the full data shape")
 
         if dy and 51 <= peek.x <= 100 and peek.y == 0:  # Top of front
             coord = Coord(X(1), Y(peek.x + 100))
@@ -141,29 +152,21 @@ class Turtle3D(Turtle):
         else:
             raise ValueError(f"No rule to handle this edge. ({peek=}, {dx=}, {dy=})")
 
-        assert coord in self.grid.coords
+        assert self.grid[coord] != VOID
         return coord, facing
 
 class Day(BaseDay):
     day = 22
+    parse_version = 2
 
-    def parse_lines(self) -> tuple[dict[Coord, bool], list[str]]:
-        coords = {}
-        for y, line in enumerate(self.data_lines):
-            if line == '':
-                break
-
-            for x, letter in enumerate(line):
-                if letter != ' ':
-                    coords[Coord(X(x + 1), Y(y + 1))] = (letter == '.')
-
+    def parse(self) -> tuple[Board, list[str]]:
+        map_lines = self.data_lines[:self.data_lines.index('')]
         moves = re.findall('[0-9]+|L|R', self.data_lines[-1])
 
-        return coords, moves
+        return Board(map_lines), moves
 
     def part_1(self):
-        coords, moves = self.parse_lines()
-        grid = Grid(coords)
+        grid, moves = self.parsed
         start_pos = Coord(grid.y_bounds[1][0], Y(1))
         turtle = Turtle(grid, start_pos, 'r')
 
@@ -177,13 +180,11 @@ class Day(BaseDay):
             'r': 0, 'd': 1, 'l': 2, 'u': 3
         }
 
-        print(turtle.pos)
-        print(turtle.dir)
-        print(f'Score is {1000 * turtle.pos.y + 4 * turtle.pos.x + scores[turtle.dir]}')
+        self.debug(turtle.pos, turtle.dir)
+        return 1000 * turtle.pos.y + 4 * turtle.pos.x + scores[turtle.dir]
 
     def part_2(self):
-        coords, moves = self.parse_lines()
-        grid = Grid(coords)
+        grid, moves = self.parsed
         start_pos = Coord(grid.y_bounds[1][0], Y(1))
         turtle = Turtle3D(grid, start_pos, 'r')
 
@@ -197,12 +198,12 @@ class Day(BaseDay):
             'r': 0, 'd': 1, 'l': 2, 'u': 3
         }
 
-        print(turtle.pos)
-        print(turtle.dir)
-        print(f'Score is {1000 * turtle.pos.y + 4 * turtle.pos.x + scores[turtle.dir]}')
+        self.debug(turtle.pos, turtle.dir)
+        return 1000 * turtle.pos.y + 4 * turtle.pos.x + scores[turtle.dir]
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 # 34541 too low
 
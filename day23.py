@@ -1,115 +1,112 @@
 import collections
-from typing import NamedTuple, NewType
 from base import BaseDay
-from tqdm import tqdm
+from grid import Grid
 
 
-X = NewType('X', int)
-Y = NewType('Y', int)
-
-
-class Coord(NamedTuple):
-    x: X
-    y: Y
-
-
-class Elf:
+class Grove:
+    """
+    Elves are flat indexes into an occupancy grid. Each round an elf moves at most one step, so the grid is padded by
+    `margin` cells and re-centred on the elves before they can reach the edge.
+    """
     dirs = 'nswe'
-    dir_peeks = {
-        'n': ((-1, -1), (0, -1), (1, -1)),
-        's': ((-1, 1), (0, 1), (1, 1)),
-        'w': ((-1, 1), (-1, 0), (-1, -1)),
-        'e': ((1, 1), (1, 0), (1, -1)),
-    }
-
-    def __init__(self, coord: Coord):
-        self.coord = coord
-        self.dir_offest = 0
-        self.proposed_move: Coord | None = None
-        self.all_dir_peeks = set()
-        for val in self.dir_peeks.values():
-            for peek in val:
-                self.all_dir_peeks.add(peek)
-
-    def propose_move(self, grid: "Grid") -> Coord | None:
-        if all(Coord(self.coord.x + x, self.coord.y + y) not in grid.elves for x, y in self.all_dir_peeks):
-            # Surrounding is empty... do nothing
-            self.proposed_move = None
-            return
-
-        for n in range(4):
-            direction = self.dirs[(n + self.dir_offest) % 4]
-            peeks = self.dir_peeks[direction]
-            if all(Coord(self.coord.x + x, self.coord.y + y) not in grid.elves for x, y in peeks):
-                self.proposed_move = Coord(self.coord.x + peeks[1][0], self.coord.y + peeks[1][1])
-                return
-    
-        self.proposed_move = None
-
-    def move(self, coord: Coord):
-        self.coord = coord
-        self.dir_offest += 1
-
+    margin = 64
 
-class Grid:
-    def __init__(self):
-        self.elves: dict[Coord, Elf] = {}
+    def __init__(self, coords: list[tuple[int, int]]):
+        self.dir_offest = 0
+        self.grid = Grid(0, 0)
+        self.elves: list[int] = []
+        self.rounds_left = 0
+        self.regrow(coords)
 
-    def move_elves(self) -> bool:
-        for elf in self.elves.values():
-            elf.propose_move(self)
+    def regrow(self, coords: list[tuple[int, int]]):
+        min_x = min(x for x, _ in coords)
+        max_x = max(x for x, _ in coords)
+        min_y = min(y for _, y in coords)
+        max_y = max(y for _, y in coords)
 
-        counter = collections.Counter(e.proposed_move for e in self.elves.values() if e.proposed_move is not None)
+        self.grid = Grid(max_x - min_x + 1, max_y - min_y + 1, pad=self.margin, origin=(min_x, min_y))
+        self.elves = [self.grid.index(x, y) for x, y in coords]
+        for elf in self.elves:
+            self.grid.cells[elf] = 1
 
-        for elf in self.elves.values():
-            if elf.proposed_move is not None and counter[elf.proposed_move] == 1:
-                elf.move(elf.proposed_move)
-            else:
-                elf.move(elf.coord)
-                # elf.proposed_move = None
+        # Elves need one cell beyond them to look at
+        self.rounds_left = self.margin - 1
 
-        new_elves = {elf.coord: elf for elf in self.elves.values()}
+    def coords(self) -> list[tuple[int, int]]:
+        return [self.grid.coord(elf) for elf in self.elves]
 
-        moves_happened = set(self.elves.keys()) == set(new_elves.keys())
-        self.elves = new_elves
+    def move_elves(self) -> bool:
+        "Returns True if no elf moved"
+        if not self.rounds_left:
+            self.regrow(self.coords())
+        self.rounds_left -= 1
+
+        cells = self.grid.cells
+        stride = self.grid.stride
+        dir_peeks = {
+            'n': (-stride - 1, -stride, -stride + 1),
+            's': (stride - 1, stride, stride + 1),
+            'w': (stride - 1, -1, -stride - 1),
+            'e': (stride + 1, 1, -stride + 1),
+        }
+        all_dir_peeks = self.grid.offsets(diagonal=True)
+        peek_order = [dir_peeks[self.dirs[(n + self.dir_offest) % 4]] for n in range(4)]
+        self.dir_offest += 1
 
-        return moves_happened
+        proposed_moves: list[int | None] = []
+        for elf in self.elves:
+            proposed = None
+            if any(cells[elf + peek] for peek in all_dir_peeks):
+                for a, b, c in peek_order:
+                    if not (cells[elf + a] or cells[elf + b] or cells[elf + c]):
+                        proposed = elf + b
+                        break
+            proposed_moves.append(proposed)
+
+        counter = collections.Counter(move for move in proposed_moves if move is not None)
+
+        moved = False
+        for n, move in enumerate(proposed_moves):
+            if move is not None and counter[move] == 1:
+                cells[self.elves[n]] = 0
+                cells[move] = 1
+                self.elves[n] = move
+                moved = True
+
+        return not moved
+
+    def bounds(self) -> tuple[int, int, int, int]:
+        coords = self.coords()
+        return (
+            min(x for x, _ in coords), max(x for x, _ in coords),
+            min(y for _, y in coords), max(y for _, y in coords)
+        )
 
     def count_empty(self) -> int:
-        # Determine bounds
-        min_x = min(c.x for c in self.elves.keys())
-        max_x = max(c.x for c in self.elves.keys())
-        min_y = min(c.y for c in self.elves.keys())
-        max_y = max(c.y for c in self.elves.keys())
-
+        min_x, max_x, min_y, max_y = self.bounds()
         return (max_x - min_x + 1) * (max_y - min_y + 1) - len(self.elves)
 
-    def output(self):
-        min_x = min(c.x for c in self.elves.keys())
-        max_x = max(c.x for c in self.elves.keys())
-        min_y = min(c.y for c in self.elves.keys())
-        max_y = max(c.y for c in self.elves.keys())
-
+    def __str__(self) -> str:
+        min_x, max_x, min_y, max_y = self.bounds()
+        lines = []
         for y in range(min_y, max_y + 1):
-            line = []
-            for x in range(min_x, max_x + 1):
-                line.append('#' if Coord(X(x), Y(y)) in self.elves else '.')
-            print(''.join(line))
+            start = self.grid.index(min_x, y)
+            lines.append(''.join('#' if cell else '.' for cell in self.grid.cells[start:start + max_x - min_x + 1]))
+
+        return '\n'.join(lines)
 
 
 class Day(BaseDay):
     day = 23
 
-    def load_grid(self) -> Grid:
-        grid = Grid()
-
+    def load_grid(self) -> Grove:
+        coords = []
         for y, line in enumerate(self.data_lines):
             for x, letter in enumerate(line):
                 if letter == '#':
-                    coord = Coord(X(x), Y(y))
-                    grid.elves[coord] = Elf(coord)
+                    coords.append((x, y))
 
-        return grid
+        return Grove(coords)
 
     def part_1(self):
         grid = self.load_grid()
@@ -117,22 +114,34 @@ class Day(BaseDay):
         for _ in range(10):
             grid.move_elves()
 
-        print(f'Answer is {grid.count_empty()}')
+        return grid.count_empty()
 
     def part_2(self):
-        grid = self.load_grid()
+        checkpoint = self.checkpoint('part 2')
+        if saved := checkpoint.load():
+            start, grid = saved.state
+            self.debug(f'Resuming at round {start + 1}')
+        else:
+            start, grid = 0, self.load_grid()
 
         answer = 0
-        for n in tqdm(range(10000)):
-            if grid.move_elves():
-                answer = n
-                break
+        with self.metrics('part 2') as metrics:
+            for n in metrics.counter('rounds').track(range(start, 10000)):
+                if checkpoint.due():
+                    checkpoint.save((n, grid))
+
+                if grid.move_elves():
+                    answer = n
+                    break
 
-        print(f'Answer is {answer + 1}')
+        checkpoint.clear()
+        self.debug(checkpoint.summary())
+        return answer + 1
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 # 3821 too low
 
-# 969 too low
\ No newline at end of file
+# 969 too low
@@ -1,8 +1,8 @@
 import math
-from typing import Generator, Iterable, Literal, NamedTuple
+from typing import Generator, Literal, NamedTuple
 from base import BaseDay
-from tqdm import tqdm
-from collections import deque
+from grid import Grid
+from search import SearchStats, bfs
 
 
 Direction = Literal['>', '<', '^', 'v']
@@ -13,9 +13,8 @@ class Coord(NamedTuple):
     y: int
 
 
-class Storm(NamedTuple):
-    coord: Coord
-    dir: Direction
+# Grid indexes of the storms moving in each direction
+Storms = dict[Direction, list[int]]
 
 
 dir_vectors: dict[Direction, tuple[int, int]] = {
@@ -26,140 +25,147 @@ dir_vectors: dict[Direction, tuple[int, int]] = {
 }
 
 
-def next_storms_state(storms: Iterable[Storm], bounds: tuple[Coord, Coord]) -> list[Storm]:
-    new_storms = []
+def storm_steps(walls: Grid, bounds: tuple[Coord, Coord]) -> dict[Direction, list[int]]:
+    "For each direction, a table of where a storm in each cell moves to next"
+    steps = {}
 
-    for storm in storms:
-        dx, dy = dir_vectors[storm.dir]
-        new_coord = Coord(storm.coord.x + dx, storm.coord.y + dy)
+    for direction, (dx, dy) in dir_vectors.items():
+        table = list(range(len(walls.cells)))
+        for x in range(bounds[0].x, bounds[1].x + 1):
+            for y in range(bounds[0].y, bounds[1].y + 1):
+                new_coord = Coord(x + dx, y + dy)
 
-        # Wrap around
-        if new_coord.x < bounds[0].x:
-            new_coord = Coord(bounds[1].x, new_coord.y)
-        elif new_coord.x > bounds[1].x:
-            new_coord = Coord(bounds[0].x, new_coord.y)
-        elif new_coord.y < bounds[0].y:
-            new_coord = Coord(new_coord.x, bounds[1].y)
-        elif new_coord.y > bounds[1].y:
-            new_coord = Coord(new_coord.x, bounds[0].y)
+                # Wrap around
+                if new_coord.x < bounds[0].x:
+                    new_coord = Coord(bounds[1].x, new_coord.y)
+                elif new_coord.x > bounds[1].x:
+                    new_coord = Coord(bounds[0].x, new_coord.y)
+                elif new_coord.y < bounds[0].y:
+                    new_coord = Coord(new_coord.x, bounds[1].y)
+                elif new_coord.y > bounds[1].y:
+                    new_coord = Coord(new_coord.x, bounds[0].y)
 
-        new_storms.append(Storm(new_coord, storm.dir))
+                table[walls.index(x, y)] = walls.index(*new_coord)
 
-    return new_storms
+        steps[direction] = table
+
+    return steps
+
+
+def next_storms_state(storms: Storms, steps: dict[Direction, list[int]]) -> Storms:
+    return {direction: [steps[direction][index] for index in indexes] for direction, indexes in storms.items()}
 
 
 class GameState(NamedTuple):
     time: int
-    position: Coord
+    position: int  # Index into the valley grid
 
 
 class Game:
-    def __init__(self, start_pos: Coord, end_pos: Coord, bounds: tuple[Coord, Coord], initial_storms: Iterable[Storm]):
+    def __init__(self, walls: Grid, start_pos: Coord, end_pos: Coord, bounds: tuple[Coord, Coord], initial_storms: Storms):
+        self.walls = walls  # Padded, so moving off the edge from the start or end just finds a wall
         self.bounds = bounds
-        self.start_pos = start_pos
-        self.end_pos = end_pos
-        self.valid_coords = {
-            self.start_pos,
-            self.end_pos
-        }
-        for x in range(self.bounds[0].x, self.bounds[1].x + 1):
-            for y in range(self.bounds[0].y, self.bounds[1].y + 1):
-                self.valid_coords.add(Coord(x, y))
-
-        # Precompute all storm states
-        self.storm_states: list[tuple[Iterable[Storm], set[Coord]]] = [
-            (initial_storms, {s.coord for s in initial_storms})
+        self.start_pos = walls.index(*start_pos)
+        self.end_pos = walls.index(*end_pos)
+        self.moves = (0,) + walls.offsets()
+        self.steps = storm_steps(walls, bounds)
+
+        # Precompute all storm states, each with a grid of where the storms are
+        self.storm_states: list[tuple[Storms, bytearray]] = [
+            (initial_storms, self.storm_cells(initial_storms))
         ]
         self.storm_modulo = math.lcm(self.bounds[1].x, self.bounds[1].y)
-        for n in tqdm(range(self.storm_modulo)):
+        for n in range(self.storm_modulo):
             self.get_storm_state(n + 1)
 
-        self.seen_states: dict[tuple[int, Coord], GameState] = {}
+    def storm_cells(self, storms: Storms) -> bytearray:
+        cells = bytearray(len(self.walls.cells))
+        for indexes in storms.values():
+            for index in indexes:
+                cells[index] = 1
+        return cells
 
-    def get_storm_state(self, time: int) -> tuple[Iterable[Storm], set[Coord]]:
+    def get_storm_state(self, time: int) -> tuple[Storms, bytearray]:
         try:
             return self.storm_states[time % self.storm_modulo]
         except IndexError:
             last_state, _ = self.storm_states[-1]
-            new_state = next_storms_state(last_state, self.bounds)
+            new_state = next_storms_state(last_state, self.steps)
             self.storm_states.append(
-                (new_state, {s.coord for s in new_state})
+                (new_state, self.storm_cells(new_state))
             )
             return self.storm_states[time]
 
-    def generate_solution(self, initial: GameState, goal_pos: Coord) -> GameState:
-        stack: deque[GameState] = deque([initial])
-        progress = tqdm()
-
-        while stack:
-            state = stack.popleft()
-            progress.update()
-            
-            seen_key = (state.time % self.storm_modulo, state.position)
-
-            if seen_key in self.seen_states:
-                continue
+    def state_key(self, state: GameState) -> int:
+        "The storms repeat, so only the time within their cycle matters"
+        return (state.time % self.storm_modulo) * len(self.walls.cells) + state.position
 
+    def generate_solution(self, initial: GameState, goal_pos: int, stats: SearchStats | None = None) -> GameState:
+        for _, state in bfs([initial], self.next_moves, self.state_key, stats=stats):
             if state.position == goal_pos:
                 return state
 
-            self.seen_states[seen_key] = state
-
-            stack.extend(self.next_moves(state))
-
         raise ValueError("No paths")
 
 
     def next_moves(self, state: GameState) -> Generator[GameState, None, None]:
-        next_storms, next_storm_coords = self.get_storm_state(state.time + 1)
+        _, next_storm_cells = self.get_storm_state(state.time + 1)
+        walls = self.walls.cells
 
-        # Stay
-        if state.position not in next_storm_coords:
-            yield GameState(state.time + 1, state.position)
-
-        # Move
-        for dx, dy in dir_vectors.values():
-            new_coord = Coord(state.position.x + dx, state.position.y + dy)
-            if new_coord not in next_storm_coords and new_coord in self.valid_coords:
-                yield GameState(state.time + 1, new_coord)
+        # Stay, or move
+        for move in self.moves:
+            new_pos = state.position + move
+            if not walls[new_pos] and not next_storm_cells[new_pos]:
+                yield GameState(state.time + 1, new_pos)
 
 
 class Day(BaseDay):
     day = 24
+    parse_version = 3
 
-    def create_game(self) -> Game:
+    def parse(self) -> Game:
         bounds = (Coord(1, 1), Coord(len(self.data_lines[0]) - 2, len(self.data_lines) - 2))
         start_pos = Coord(self.data_lines[0].index('.'), 0)
         end_pos = Coord(self.data_lines[-1].index('.'), len(self.data_lines) - 1)
 
-        storms = []
+        walls = Grid.from_lines(self.data_lines, {'#': 1, '.': 0, '<': 0, '>': 0, '^': 0, 'v': 0}, fill=1, pad=1)
+
+        storms: Storms = {direction: [] for direction in dir_vectors}
         for y, line in enumerate(self.data_lines):
             for x, letter in enumerate(line):
-                if letter in '<>^v':
-                    storms.append(Storm(Coord(x, y), letter))
+                if letter in storms:
+                    storms[letter].append(walls.index(x, y))
 
-        return Game(start_pos, end_pos, bounds, storms)
+        return Game(walls, start_pos, end_pos, bounds, storms)
 
     def part_1(self):
-        self.setup_gc()
-        game = self.create_game()
+        game = self.parsed
+        stats = SearchStats()
 
-        result = game.generate_solution(GameState(0, game.start_pos), game.end_pos)
+        with self.metrics('part 1') as metrics:
+            metrics.gauge('states', lambda: stats.expanded)
+            result = game.generate_solution(GameState(0, game.start_pos), game.end_pos, stats)
 
-        print(result.time)
+        self.debug(stats.summary())
+        return result.time
 
     def part_2(self):
-        game = self.create_game()
+        game = self.parsed
+        stats = SearchStats()
 
-        result = game.generate_solution(GameState(0, game.start_pos), game.end_pos)
-        result_2 = game.generate_solution(result, game.start_pos)
-        result_3 = game.generate_solution(result_2, game.end_pos)
+        with self.metrics('part 2') as metrics:
+            metrics.gauge('states', lambda: stats.expanded)
+            result = game.generate_solution(GameState(0, game.start_pos), game.end_pos, stats)
+            result_2 = game.generate_solution(result, game.start_pos, stats)
+            result_3 = game.generate_solution(result_2, game.end_pos, stats)
 
-        print(f'{result.time=} {result_2.time=} {result_3.time=}')
-        print(result_3.time)
+        self.debug(f'{result.time=} {result_2.time=} {result_3.time=}')
+        self.debug(stats.summary())
+        return result_3.time
 
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 # 1681 too high
@@ -58,19 +58,21 @@ def int_to_snafu(val: int) -> str:
     power = 0
     output = ''
 
-    # Find size of biggest digit we need
-    while val > (5 ** power) * 2:
+    # Find size of biggest digit we need: n digits reach up to (5^n - 1) / 2
+    while abs(val) > (5 ** (power + 1) - 1) // 2:
         power += 1
 
     while power >= 0:
-        if remaining > (5 ** power):
+        # The furthest the lower digits can reach either way
+        rest = (5 ** power - 1) // 2
+        if remaining > (5 ** power) + rest:
             digit = '2'
-        elif remaining > 0:
+        elif remaining > rest:
             digit = '1'
-        elif remaining < -1 * (5 ** power):
+        elif remaining < -1 * (5 ** power) - rest:
             digit = '='
-        elif remaining < 0:
-            digit = '-' 
+        elif remaining < -rest:
+            digit = '-'
         else:
             digit = '0'
 
@@ -89,20 +91,21 @@ class Day(BaseDay):
     def part_1(self):
         total = '0'
 
-        for line in self.data_lines:
+        for line in self.iter_lines():
             temp_total = total
             total = add_snafu(total, line)
-            print(f'{temp_total} ({snafu_to_int(temp_total)}) + {line} ({snafu_to_int(line)}) >>> {total} ({snafu_to_int(total)})')
+            self.debug(f'{temp_total} ({snafu_to_int(temp_total)}) + {line} ({snafu_to_int(line)}) >>> {total} ({snafu_to_int(total)})')
             int_to_snafu(snafu_to_int(line))
 
-        print(total)
+        return total
 
 
     def part_2(self):
         pass
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()
 
 
 # 2==02=120-=-2110-0=1 is wrong
\ No newline at end of file
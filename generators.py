@@ -0,0 +1,184 @@
+"""
+Seeded generators of valid, larger-than-real puzzle inputs, for finding solutions that scale badly.
+
+Each generator takes a random source and a scale, where a scale of 1 is about the size of the real input. Generated
+files are written to `inputs/generated/` so they can be used like any other input:
+
+    $ python generators.py 1 10 100    # Scales to generate, for every day that has a generator
+"""
+import math
+from pathlib import Path
+import random
+import string
+import sys
+from typing import Callable
+
+
+GENERATED_DIR = Path(__file__).parent.joinpath('inputs/generated')
+
+
+def day_1(rng: random.Random, scale: int) -> str:
+    elves = []
+    for _ in range(250 * scale):
+        elves.append('\n'.join(str(rng.randint(1000, 60000)) for _ in range(rng.randint(1, 15))))
+    return '\n\n'.join(elves) + '\n'
+
+
+def day_2(rng: random.Random, scale: int) -> str:
+    return ''.join(f'{rng.choice("ABC")} {rng.choice("XYZ")}\n' for _ in range(2500 * scale))
+
+
+def day_3(rng: random.Random, scale: int) -> str:
+    # Each group of three only shares its badge, and each rucksack's halves only share one item
+    lines = []
+    for _ in range(100 * scale):
+        letters = list(string.ascii_letters)
+        rng.shuffle(letters)
+        badge, rest = letters[0], letters[1:]
+
+        for elf in range(3):
+            pool = rest[elf * 17:(elf + 1) * 17]
+            common, first_pool, second_pool = pool[0], pool[1:9], pool[9:]
+            half = rng.randint(8, 16)
+            first = [common, badge] + rng.choices(first_pool, k=half - 2)
+            second = [common] + rng.choices(second_pool, k=half - 1)
+            rng.shuffle(first)
+            rng.shuffle(second)
+            lines.append(''.join(first + second))
+
+    return '\n'.join(lines) + '\n'
+
+
+def day_4(rng: random.Random, scale: int) -> str:
+    def section_range() -> str:
+        a, b = sorted((rng.randint(1, 99), rng.randint(1, 99)))
+        return f'{a}-{b}'
+
+    return ''.join(f'{section_range()},{section_range()}\n' for _ in range(1000 * scale))
+
+
+def day_5(rng: random.Random, scale: int) -> str:
+    # Same 9 stacks / 8 row header as the real input; never empty a stack, so every move is valid
+    heights = [rng.randint(1, 8) for _ in range(9)]
+    rows = []
+    for row in range(8, 0, -1):
+        rows.append(' '.join(
+            f'[{rng.choice(string.ascii_uppercase)}]' if height >= row else '   ' for height in heights
+        ))
+
+    lines = rows + [' ' + '   '.join(str(n) for n in range(1, 10)) + ' ', '']
+    for _ in range(500 * scale):
+        start = rng.choice([idx for idx, height in enumerate(heights) if height > 1])
+        end = rng.choice([idx for idx in range(9) if idx != start])
+        n = rng.randint(1, heights[start] - 1)
+        heights[start] -= n
+        heights[end] += n
+        lines.append(f'move {n} from {start + 1} to {end + 1}')
+
+    return '\n'.join(lines) + '\n'
+
+
+def day_6(rng: random.Random, scale: int) -> str:
+    # Only three different letters until the very end, so the markers are as late as possible
+    return ''.join(rng.choices('abc', k=4096 * scale - 26)) + string.ascii_lowercase + '\n'
+
+
+def day_7(rng: random.Random, scale: int) -> str:
+    # Random recursive tree: each new directory hangs off a random existing one, then walk it depth first
+    children: list[list[int]] = [[]]
+    for idx in range(1, 180 * scale):
+        children[rng.randrange(idx)].append(idx)
+        children.append([])
+
+    lines = ['$ cd /']
+    stack: list[int | None] = [0]  # None is a cd back out of a directory
+    while stack:
+        node = stack.pop()
+        if node is None:
+            lines.append('$ cd ..')
+            continue
+
+        if node != 0:
+            lines.append(f'$ cd d{node}')
+        lines.append('$ ls')
+        lines.extend(f'dir d{child}' for child in children[node])
+        lines.extend(f'{rng.randint(1000, 300000)} f{n}.txt' for n in range(rng.randint(0, 4)))
+
+        for child in reversed(children[node]):
+            stack.extend([None, child])
+
+    return '\n'.join(lines) + '\n'
+
+
+def _square_grid(rng: random.Random, side: int, cell: Callable[[], str]) -> str:
+    return ''.join(''.join(cell() for _ in range(side)) + '\n' for _ in range(side))
+
+
+def day_8(rng: random.Random, scale: int) -> str:
+    return _square_grid(rng, round(99 * math.sqrt(scale)), lambda: str(rng.randint(0, 9)))
+
+
+def day_9(rng: random.Random, scale: int) -> str:
+    return ''.join(f'{rng.choice("UDLR")} {rng.randint(1, 19)}\n' for _ in range(2000 * scale))
+
+
+def day_13(rng: random.Random, scale: int) -> str:
+    def packet(depth: int = 0) -> str:
+        items = [
+            packet(depth + 1) if depth < 4 and rng.random() < 0.3 else str(rng.randint(0, 10))
+            for _ in range(rng.randint(0, 5))
+        ]
+        return '[' + ','.join(items) + ']'
+
+    return '\n\n'.join(f'{packet()}\n{packet()}' for _ in range(150 * scale)) + '\n'
+
+
+def day_18(rng: random.Random, scale: int) -> str:
+    # Coordinates stay non-negative, as day 18 floods from (-1, -1, -1)
+    count = 2000 * scale
+    bound = math.ceil((count * 3) ** (1 / 3))
+    cubes: set[tuple[int, int, int]] = set()
+    while len(cubes) < count:
+        cubes.add((rng.randrange(bound), rng.randrange(bound), rng.randrange(bound)))
+
+    return ''.join(f'{x},{y},{z}\n' for x, y, z in cubes)
+
+
+def day_20(rng: random.Random, scale: int) -> str:
+    # Exactly one zero
+    numbers = [rng.choice((-1, 1)) * rng.randint(1, 10000) for _ in range(5000 * scale - 1)]
+    numbers.insert(rng.randrange(len(numbers) + 1), 0)
+    return ''.join(f'{n}\n' for n in numbers)
+
+
+def day_23(rng: random.Random, scale: int) -> str:
+    return _square_grid(rng, round(73 * math.sqrt(scale)), lambda: '#' if rng.random() < 0.5 else '.')
+
+
+GENERATORS: dict[int, Callable[[random.Random, int], str]] = {
+    1: day_1, 2: day_2, 3: day_3, 4: day_4, 5: day_5, 6: day_6, 7: day_7, 8: day_8, 9: day_9,
+    13: day_13, 18: day_18, 20: day_20, 23: day_23,
+}
+
+
+def generate(day: int, scale: int, seed: int = 0) -> str:
+    """
+    Write a generated input for `day` (unless it already exists) and return the filename to give to `Day()`.
+    The same day, scale and seed always produce the same input.
+    """
+    filename = f'generated/day_{day}_x{scale}_seed{seed}.txt'
+    path = GENERATED_DIR.parent.joinpath(filename)
+    if not path.exists():
+        GENERATED_DIR.mkdir(exist_ok=True)
+        rng = random.Random(f'{day}-{scale}-{seed}')
+        temp_path = path.with_suffix('.tmp')
+        temp_path.write_text(GENERATORS[day](rng, scale))
+        temp_path.replace(path)
+
+    return filename
+
+
+if __name__ == '__main__':
+    for scale in [int(arg) for arg in sys.argv[1:]] or [1, 10, 100, 1000]:
+        for day in GENERATORS:
+            print(generate(day, scale))
@@ -0,0 +1,102 @@
+"""
+A compact 2D grid of small integers (0-255), shared by the days that work on a map.
+
+Cells are stored row by row in one `bytearray`, so each costs a byte and finding a neighbour is index arithmetic rather
+than hashing a coordinate. Hot loops should work with flat indexes (see `index()` and `offsets()`) and `cells` directly.
+
+A `pad` of extra cells on every side lets those loops step past the edge without bounds checks, and `origin` allows
+coordinates that don't start at (0, 0).
+"""
+import copy
+from typing import Iterable, Iterator, Optional
+
+
+class Grid:
+    def __init__(self, width: int, height: int, fill: int = 0, pad: int = 0, origin: tuple[int, int] = (0, 0)):
+        self.width = width
+        self.height = height
+        self.pad = pad
+        self.origin_x, self.origin_y = origin  # Coordinate of the top left cell, not counting padding
+        self.stride = width + 2 * pad
+        self.cells = bytearray([fill]) * (self.stride * (height + 2 * pad))
+
+    @classmethod
+    def from_lines(
+        cls, lines: Iterable[str], values: Optional[dict[str, int]] = None, fill: int = 0, pad: int = 0
+    ) -> 'Grid':
+        """
+        One row per line. `values` maps characters to cell values; without it, digits map to their value.
+        Short lines are filled out with `fill`.
+        """
+        rows = [line.encode() for line in lines]
+        table = bytearray(range(256))
+        for char, value in (values or {str(n): n for n in range(10)}).items():
+            table[ord(char)] = value
+
+        grid = cls.__new__(cls)
+        Grid.__init__(grid, max(len(row) for row in rows), len(rows), fill, pad)
+        for y, row in enumerate(rows):
+            start = grid.index(0, y)
+            grid.cells[start:start + len(row)] = row.translate(table)
+
+        return grid
+
+    def copy(self) -> 'Grid':
+        grid = copy.copy(self)
+        grid.cells = self.cells[:]
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        return (y - self.origin_y + self.pad) * self.stride + (x - self.origin_x + self.pad)
+
+    def coord(self, index: int) -> tuple[int, int]:
+        row, column = divmod(index, self.stride)
+        return column - self.pad + self.origin_x, row - self.pad + self.origin_y
+
+    def offsets(self, diagonal: bool = False) -> tuple[int, ...]:
+        "Index differences to the neighbouring cells: right, left, up, down, then the diagonals if asked for"
+        stride = self.stride
+        offsets = (1, -1, -stride, stride)
+        if diagonal:
+            offsets += (-stride - 1, -stride + 1, stride - 1, stride + 1)
+        return offsets
+
+    def contains(self, x: int, y: int) -> bool:
+        "Whether (x, y) is inside the grid, not counting padding"
+        return (
+            self.origin_x <= x < self.origin_x + self.width
+            and self.origin_y <= y < self.origin_y + self.height
+        )
+
+    def __contains__(self, coord: tuple[int, int]) -> bool:
+        return self.contains(*coord)
+
+    def __getitem__(self, coord: tuple[int, int]) -> int:
+        return self.cells[self.index(*coord)]
+
+    def __setitem__(self, coord: tuple[int, int], value: int):
+        self.cells[self.index(*coord)] = value
+
+    def indexes(self) -> Iterator[int]:
+        "Every index inside the grid, not counting padding, row by row"
+        for y in range(self.origin_y, self.origin_y + self.height):
+            start = self.index(self.origin_x, y)
+            yield from range(start, start + self.width)
+
+    def neighbours(self, index: int, diagonal: bool = False) -> Iterator[int]:
+        "Indexes of the neighbours of `index` that are inside the grid"
+        x, y = self.coord(index)
+        for offset, (dx, dy) in zip(
+            self.offsets(diagonal), ((1, 0), (-1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1))
+        ):
+            if self.contains(x + dx, y + dy):
+                yield index + offset
+
+    def render(self, chars: str) -> str:
+        "Draw the grid, with cells of value n drawn as chars[n]"
+        table = bytes(ord(chars[n]) if n < len(chars) else ord('?') for n in range(256))
+        rows = []
+        for y in range(self.origin_y, self.origin_y + self.height):
+            start = self.index(self.origin_x, y)
+            rows.append(self.cells[start:start + self.width].translate(table).decode())
+        return '\n'.join(rows)
@@ -0,0 +1,161 @@
+"""
+Cheap progress reporting for long running loops, in place of tqdm.
+
+Loops only bump plain counters (or nothing at all: a gauge reads a number the code keeps anyway, such as
+`SearchStats.expanded`). While a `Metrics` block is active, a background thread samples them every `interval` seconds
+and shows the totals and throughput on stderr. At the end it prints a summary, and can also write the summary and
+samples as JSON.
+
+    with self.metrics('part 2') as metrics:
+        rows = metrics.counter('rows')
+        for row in rows.track(all_rows):
+            ...
+
+With `show=False` the samples are still taken (for the JSON) but nothing is printed. With `enabled=False` nothing is
+started, `track()` returns the iterable untouched, and counting does nothing.
+"""
+import json
+from pathlib import Path
+import sys
+import threading
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+
+def _si(value: float) -> str:
+    for threshold, suffix in ((1e9, 'G'), (1e6, 'M'), (1e3, 'K')):
+        if abs(value) >= threshold:
+            return f'{value / threshold:.1f}{suffix}'
+    return f'{value:.0f}'
+
+
+class Counter:
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+
+    def add(self, n: int = 1):
+        self.value += n
+
+    def track(self, iterable: Iterable[T]) -> Iterator[T]:
+        "Count each item as it's taken. Costs a generator step per item, so prefer `add(n)` in the innermost loops."
+        for item in iterable:
+            self.value += 1
+            yield item
+
+
+class _NullCounter(Counter):
+    def add(self, n: int = 1):
+        pass
+
+    def track(self, iterable: Iterable[T]) -> Iterable[T]:  # type: ignore[override]
+        return iterable
+
+
+class Metrics:
+    def __init__(
+        self, name: str, enabled: bool = True, show: bool = True, interval: float = 1.0, output: Optional[Path] = None
+    ):
+        self.name = name
+        self.enabled = enabled
+        self.show_progress = show
+        self.interval = interval
+        self.output = output
+
+        self.counters: list[Counter] = []
+        self.gauges: dict[str, Callable[[], float]] = {}
+        self.notes: dict[str, object] = {}
+        self.samples: list[tuple[float, dict[str, float]]] = []
+        self.start = 0.0
+        self.elapsed = 0.0
+        self._width = 0  # Of the last line shown, so a shorter one can cover it
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def counter(self, name: str) -> Counter:
+        if not self.enabled:
+            return _NullCounter(name)
+
+        counter = Counter(name)
+        self.counters.append(counter)
+        return counter
+
+    def gauge(self, name: str, read: Callable[[], float]):
+        "Sample a running total that's already being kept, at no cost to the loop"
+        if self.enabled:
+            self.gauges[name] = read
+
+    def note(self, name: str, value: object):
+        "Show a latest value (such as the best answer so far) alongside the counts"
+        if self.enabled:
+            self.notes[name] = value
+
+    def read(self) -> dict[str, float]:
+        values = {counter.name: counter.value for counter in self.counters}
+        values.update((name, read()) for name, read in self.gauges.items())
+        return values
+
+    def sample(self):
+        now = perf_counter() - self.start
+        values = self.read()
+        previous_time, previous = self.samples[-1] if self.samples else (0.0, {})
+        self.samples.append((now, values))
+
+        rates = {
+            name: (value - previous.get(name, 0)) / (now - previous_time) if now > previous_time else 0.0
+            for name, value in values.items()
+        }
+        self.show(now, values, rates, end='\r')
+
+    def show(self, elapsed: float, values: dict[str, float], rates: dict[str, float], end: str):
+        parts = [f'{name} {_si(value)} ({_si(rates[name])}/s)' for name, value in values.items()]
+        parts += [f'{name} {value}' for name, value in self.notes.items()]
+        if not self.show_progress:
+            return
+
+        line = f'{self.name}: ' + ', '.join(parts) + f' [{elapsed:.1f}s]'
+        print(line.ljust(self._width), end=end, file=sys.stderr, flush=True)
+        self._width = len(line)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        if self.enabled:
+            self.start = perf_counter()
+            self._thread = threading.Thread(target=self._run, name=f'metrics: {self.name}', daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if not self.enabled:
+            return
+
+        self._stop.set()
+        assert self._thread is not None
+        self._thread.join()
+        self.elapsed = perf_counter() - self.start
+
+        totals = self.read()
+        rates = {name: total / self.elapsed if self.elapsed else 0.0 for name, total in totals.items()}
+        self.show(self.elapsed, totals, rates, end='\n')
+
+        if self.output:
+            self.write_json(totals, rates)
+
+    def write_json(self, totals: dict[str, float], rates: dict[str, float]):
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        self.output.write_text(json.dumps({
+            'name': self.name,
+            'elapsed': self.elapsed,
+            'totals': totals,
+            'rates': rates,
+            'notes': {name: str(value) for name, value in self.notes.items()},
+            'samples': [{'time': t, 'values': values} for t, values in self.samples],
+        }, indent=2))
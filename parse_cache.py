@@ -0,0 +1,89 @@
+"""
+On-disk cache of parsed inputs, so repeated runs (and benchmark loops) can skip parsing.
+
+Entries are keyed by a hash of the raw input along with the day's class and `parse_version`. Bump the version whenever
+a day's parsed structure changes shape, and older entries will simply stop being used (and eventually evicted).
+"""
+import hashlib
+import os
+from pathlib import Path
+import pickle
+import tempfile
+from typing import Any, Optional
+
+
+class ParseCache:
+    suffix = '.pickle'
+
+    def __init__(self, directory: Path, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(data: str, owner: str, version: int) -> str:
+        digest = hashlib.sha256(data.encode()).hexdigest()[:24]
+        return f'{owner}-v{version}-{digest}'
+
+    def path_for(self, key: str) -> Path:
+        return self.directory.joinpath(key + self.suffix)
+
+    def get(self, key: str) -> Optional[Any]:
+        "The cached value, or None if there isn't a usable one"
+        path = self.path_for(key)
+        try:
+            with path.open('rb') as f:
+                stored_key, value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated, corrupt, or refers to classes that no longer exist. Throw it away and parse again.
+            path.unlink(missing_ok=True)
+            return None
+
+        if stored_key != key:
+            path.unlink(missing_ok=True)
+            return None
+
+        try:
+            path.touch()  # Mark as recently used, for eviction
+        except FileNotFoundError:
+            pass  # Evicted by another process since it was read, which is fine
+        return value
+
+    def put(self, key: str, value: Any):
+        "Store a value, if it can be. A failed write only means the next run parses again, so it never raises."
+        path = self.path_for(key)
+        temp_path = None
+
+        try:
+            self.directory.mkdir(exist_ok=True)
+            # A unique temporary name, as other processes may be writing the same key at the same time
+            fd, temp_name = tempfile.mkstemp(prefix=path.name + '.', suffix='.tmp', dir=self.directory)
+            temp_path = Path(temp_name)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            # Atomic, so a reader never sees a half written entry
+            os.replace(temp_path, path)
+            self.evict()
+        except (OSError, pickle.PicklingError, TypeError, AttributeError, RecursionError):
+            # Not everything can be pickled (those days just don't get cached), and the disk may be full or read only
+            if temp_path is not None:
+                temp_path.unlink(missing_ok=True)
+
+    def evict(self):
+        "Remove the least recently used entries until the cache fits within max_bytes"
+        entries = []
+        for path in self.directory.glob('*' + self.suffix):
+            try:
+                entries.append((path.stat(), path))
+            except FileNotFoundError:
+                pass  # Already removed by another process
+        entries.sort(key=lambda e: e[0].st_mtime)
+        total = sum(stat.st_size for stat, _ in entries)
+
+        for stat, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= stat.st_size
@@ -0,0 +1,163 @@
+"""
+Downloads puzzle inputs into `inputs/`, several at once.
+
+    $ python prefetch.py                 # Every day that isn't downloaded yet
+    $ python prefetch.py 1 2 3 --refresh
+
+Downloads share one pooled session, with a limit on how many run at once, a timeout, and retries with exponential
+backoff on network and server errors. Each file is written under a temporary name and renamed into place, so an
+interrupted download never leaves a partial input behind.
+
+Each response's ETag and Last-Modified are kept in `inputs/http_cache.json`, so `--refresh` sends a conditional request
+and only rewrites inputs that have changed. `--base-url` points it at another server, such as a local stand-in.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Iterable, Literal, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+INPUTS_DIR = Path(__file__).parent.joinpath('inputs')
+AOC_URL = 'https://adventofcode.com'
+YEAR = 2022
+DAYS = range(1, 26)
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+FetchStatus = Literal['fetched', 'unchanged', 'present', 'failed']
+
+
+class FetchResult(NamedTuple):
+    day: int
+    status: FetchStatus
+    error: Optional[str] = None
+
+
+def write_atomic(path: Path, text: str):
+    "Write to a temporary file alongside, then rename it over `path`"
+    temp_path = path.with_name(path.name + '.tmp')
+    temp_path.write_text(text)
+    os.replace(temp_path, path)
+
+
+class Prefetcher:
+    def __init__(
+        self, base_url: str = AOC_URL, directory: Path = INPUTS_DIR, jobs: int = 4, retries: int = 3,
+        backoff: float = 0.5, timeout: float = 10.0
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.directory = directory
+        self.jobs = jobs
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=jobs)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        cookie_path = directory.joinpath('cookie.txt')
+        if cookie_path.exists():
+            self.session.cookies.set('session', cookie_path.read_text().strip())
+
+        self.validators_path = directory.joinpath('http_cache.json')
+        self.validators: dict[str, dict[str, str]] = (
+            json.loads(self.validators_path.read_text()) if self.validators_path.exists() else {}
+        )
+        self.lock = threading.Lock()
+
+    def url(self, day: int) -> str:
+        return f'{self.base_url}/{YEAR}/day/{day}/input'
+
+    def path(self, day: int) -> Path:
+        return self.directory.joinpath(f'day_{day}.txt')
+
+    def get(self, day: int, headers: dict[str, str]) -> requests.Response:
+        "GET an input, retrying network errors and server errors with exponential backoff"
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+
+            try:
+                response = self.session.get(self.url(day), headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                continue
+
+            if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                return response
+
+        raise AssertionError("Unreachable: the last attempt always returns or raises")
+
+    def fetch(self, day: int, refresh: bool = False) -> FetchStatus:
+        "Download one day's input if it's missing (or, with `refresh`, has changed). Raises on failure."
+        path = self.path(day)
+        headers = {}
+        if path.exists():
+            if not refresh:
+                return 'present'
+
+            validators = self.validators.get(str(day), {})
+            if 'etag' in validators:
+                headers['If-None-Match'] = validators['etag']
+            if 'last_modified' in validators:
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        response = self.get(day, headers)
+        if response.status_code == 304:
+            return 'unchanged'
+        response.raise_for_status()
+
+        write_atomic(path, response.text)
+
+        with self.lock:
+            self.validators[str(day)] = {
+                name: value for name, value in (
+                    ('etag', response.headers.get('ETag')),
+                    ('last_modified', response.headers.get('Last-Modified')),
+                ) if value
+            }
+            write_atomic(self.validators_path, json.dumps(self.validators, indent=2, sort_keys=True))
+
+        return 'fetched'
+
+    def _fetch_result(self, day: int, refresh: bool) -> FetchResult:
+        try:
+            return FetchResult(day, self.fetch(day, refresh))
+        except requests.RequestException as e:
+            return FetchResult(day, 'failed', str(e))
+
+    def fetch_all(self, days: Iterable[int], refresh: bool = False) -> list[FetchResult]:
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            return list(pool.map(lambda day: self._fetch_result(day, refresh), days))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('days', type=int, nargs='*', help='Days to fetch (default: all)')
+    parser.add_argument('--refresh', action='store_true', help='Re-check inputs already downloaded')
+    parser.add_argument('--jobs', type=int, default=4, help='Downloads at once')
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--timeout', type=float, default=10.0, help='Seconds')
+    parser.add_argument('--base-url', default=AOC_URL)
+    args = parser.parse_args()
+
+    prefetcher = Prefetcher(args.base_url, jobs=args.jobs, retries=args.retries, timeout=args.timeout)
+    results = prefetcher.fetch_all(args.days or DAYS, args.refresh)
+
+    for result in results:
+        print(f'Day {result.day:>2}: {result.status}' + (f' ({result.error})' if result.error else ''))
+
+    if any(result.status == 'failed' for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
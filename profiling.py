@@ -0,0 +1,69 @@
+"""
+Per-part CPU and memory profiling, used by `BaseDay.execute(profile=True)`.
+
+For each part this writes `profiles/day_N_part_M.pstats` (open with `python -m pstats` or snakeviz) and
+`profiles/day_N_part_M_allocations.txt` with the lines that allocated the most memory. Given a `run` number, as when
+several runs of a day are profiled at once, the names end `_run_R` so the runs don't overwrite each other.
+"""
+import cProfile
+import gc
+from pathlib import Path
+import tracemalloc
+from typing import Optional
+
+
+PROFILE_DIR = Path(__file__).parent.joinpath('profiles')
+
+
+class PartProfiler:
+    def __init__(self, day: int, part: int, top_n: int = 20, run: Optional[int] = None):
+        self.name = f'day_{day}_part_{part}' + (f'_run_{run}' if run is not None else '')
+        self.top_n = top_n
+        self.profile = cProfile.Profile()
+        self.peak_heap = 0
+        self.gc_collections = [0, 0, 0]
+
+    def __enter__(self):
+        self.gc_before = [gen['collections'] for gen in gc.get_stats()]
+        tracemalloc.start()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.profile.disable()
+        snapshot = tracemalloc.take_snapshot()
+        _, self.peak_heap = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.gc_collections = [gen['collections'] - before for gen, before in zip(gc.get_stats(), self.gc_before)]
+
+        if type is None:
+            self.write(snapshot)
+
+    def write(self, snapshot: tracemalloc.Snapshot):
+        PROFILE_DIR.mkdir(exist_ok=True)
+        self.profile.dump_stats(PROFILE_DIR.joinpath(f'{self.name}.pstats'))
+
+        stats = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ]).statistics('lineno')
+        lines = [f'Top {self.top_n} allocating lines for {self.name}']
+        lines += [str(stat) for stat in stats[:self.top_n]]
+        PROFILE_DIR.joinpath(f'{self.name}_allocations.txt').write_text('\n'.join(lines) + '\n')
+
+    @staticmethod
+    def peak_rss() -> Optional[int]:
+        "Peak resident set size of the whole process so far, in bytes (Linux reports KB). None on Windows."
+        try:
+            import resource  # Unix only
+        except ImportError:
+            return None
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def summary(self) -> str:
+        collections = '/'.join(str(n) for n in self.gc_collections)
+        rss = self.peak_rss()
+        return (
+            f'peak heap {self.peak_heap / 1024 / 1024:.1f}MB, '
+            + (f'peak RSS {rss / 1024 / 1024:.1f}MB, ' if rss is not None else '')
+            + f'GC collections (gen 0/1/2) {collections}'
+        )
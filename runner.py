@@ -0,0 +1,273 @@
+"""
+Runs every day's solution in one go, spreading the days across a process pool. Both parts of a day run in the same
+worker so the input is only parsed once.
+Answers are checked against `answers.json` where known.
+
+    $ python runner.py
+    $ python runner.py --check
+
+`--check` is the regression suite: every day runs on its test input (where there is one) as well as its full input,
+with answers checked against `answers_test.json` and `answers.json`. Any part that is still running when it reaches
+its day's `time_budgets` is stopped. The exit status is non-zero if any part gives a wrong answer, fails, or runs over
+budget, so a slowdown fails the check just as a wrong answer does.
+"""
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext, redirect_stderr, redirect_stdout
+import importlib
+import io
+import json
+import os
+from pathlib import Path
+import signal
+import traceback
+from typing import NamedTuple, Optional
+
+from base import BaseDay, Timer
+from gc_policy import DEFAULT_GC_MODE, GC_MODES, GcMode, GcPauses, apply_gc_policy, freeze_parsed
+
+
+PARTS = (1, 2)
+ANSWERS_PATH = Path(__file__).parent.joinpath('answers.json')
+TEST_ANSWERS_PATH = Path(__file__).parent.joinpath('answers_test.json')
+INPUTS_DIR = Path(__file__).parent.joinpath('inputs')
+NOT_RUN = ('not implemented', 'no time budget')
+
+
+class DaySpec(NamedTuple):
+    day: int
+    module: str
+    class_name: str
+
+
+class PartResult(NamedTuple):
+    day: int
+    part: int
+    elapsed: float
+    answer: Optional[str]
+    error: Optional[str] = None
+    gc_pause_total: float = 0.0
+    gc_pause_max: float = 0.0
+    budget: Optional[float] = None
+
+
+class DayResult(NamedTuple):
+    day: int
+    parse_elapsed: float
+    parts: list[PartResult]
+    data_filename: Optional[str] = None
+
+
+class OverBudget(Exception):
+    pass
+
+
+def _over_budget(signum, frame):
+    raise OverBudget
+
+
+@contextmanager
+def time_limit(seconds: Optional[float]):
+    "Raise OverBudget in the main thread if the block is still running after `seconds`. Only on Unix."
+    if seconds is None or not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    previous = signal.signal(signal.SIGALRM, _over_budget)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def discover_days() -> list[DaySpec]:
+    "Import every dayNN module and find the BaseDay subclasses it defines"
+    specs = []
+    for path in sorted(Path(__file__).parent.glob('day[0-9][0-9].py')):
+        module = importlib.import_module(path.stem)
+        for obj in vars(module).values():
+            if (
+                isinstance(obj, type) and issubclass(obj, BaseDay) and obj is not BaseDay
+                and obj.__module__ == module.__name__ and obj.runnable
+            ):
+                specs.append(DaySpec(obj.day, module.__name__, obj.__name__))
+
+    specs.sort()
+    return specs
+
+
+def run_part(
+    day: BaseDay, part: int, enforce_budget: bool = False, profile: bool = False, run: Optional[int] = None
+) -> PartResult:
+    """
+    Run one part. With `enforce_budget`, a part is stopped at its time budget, and skipped if it hasn't got one. With
+    `profile`, it runs under PartProfiler, which writes its results to `profiles/` (named by `run`, if given).
+    """
+    answer = None
+    error = None
+    budget = day.time_budgets.get(part)
+    if enforce_budget and budget is None:
+        return PartResult(day.day, part, 0.0, None, 'no time budget')
+
+    profiler = nullcontext()
+    if profile:
+        from profiling import PartProfiler  # Only loads cProfile and tracemalloc when they're wanted
+        profiler = PartProfiler(day.day, part, run=run)
+
+    with profiler, GcPauses() as pauses, Timer() as t:
+        try:
+            with time_limit(budget if enforce_budget else None):
+                answer = getattr(day, f'part_{part}')()
+        except NotImplementedError:
+            error = 'not implemented'
+        except OverBudget:
+            error = f'stopped at its {budget:g}s time budget'
+        except Exception:
+            error = traceback.format_exc()
+
+    return PartResult(
+        day.day, part, t.elapsed, None if answer is None else str(answer), error, pauses.total, pauses.max, budget
+    )
+
+
+def run_day(
+    spec: DaySpec, data_filename: Optional[str] = None, gc_mode: GcMode = DEFAULT_GC_MODE, enforce_budget: bool = False,
+    parts: tuple[int, ...] = PARTS, profile: bool = False, run: Optional[int] = None
+) -> DayResult:
+    "Parse a day's input once and run its `parts` on it. Executed inside a worker process."
+    day_cls = getattr(importlib.import_module(spec.module), spec.class_name)
+    day = day_cls(data_filename)
+    day.show_progress = False
+    day.checkpoint_interval = None
+    apply_gc_policy(gc_mode)
+
+    # stderr is only progress output, which is meaningless when interleaved from many processes
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        with Timer() as t:
+            try:
+                day.parsed
+            except Exception:
+                error = traceback.format_exc()
+                failed = [PartResult(spec.day, part, 0.0, None, error) for part in parts]
+                return DayResult(spec.day, t.elapsed, failed, data_filename)
+        freeze_parsed(gc_mode)
+
+        return DayResult(
+            spec.day, t.elapsed, [run_part(day, part, enforce_budget, profile, run) for part in parts], data_filename
+        )
+
+
+def run_all(
+    specs: list[DaySpec], jobs: Optional[int] = None, gc_mode: GcMode = DEFAULT_GC_MODE, with_tests: bool = False,
+    enforce_budget: bool = False
+) -> list[DayResult]:
+    "Run every day on its full input, and also on its test input (if it has one) `with_tests`"
+    runs: list[tuple[DaySpec, Optional[str]]] = [(spec, None) for spec in specs]
+    if with_tests:
+        runs += [
+            (spec, f'day_{spec.day}_test.txt') for spec in specs
+            if INPUTS_DIR.joinpath(f'day_{spec.day}_test.txt').exists()
+        ]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = [pool.submit(run_day, spec, data_filename, gc_mode, enforce_budget) for spec, data_filename in runs]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    # Test inputs first, as they're the likelier to show what's wrong
+    results.sort(key=lambda r: (r.day, r.data_filename is None))
+    return results
+
+
+def load_answers(path: Path = ANSWERS_PATH) -> dict[tuple[int, int], str]:
+    "Known answers, keyed by (day, part)"
+    if not path.exists():
+        return {}
+
+    answers = json.loads(path.read_text())
+    return {(int(day), int(part)): answer for day, parts in answers.items() for part, answer in parts.items()}
+
+
+def check(result: PartResult, answers: dict[tuple[int, int], str]) -> str:
+    expected = answers.get((result.day, result.part))
+    if expected is None:
+        return ''
+    return 'ok' if result.answer == expected else 'WRONG'
+
+
+def verdict(result: PartResult, answers: dict[tuple[int, int], str]) -> str:
+    "How a part did in `--check`. Anything in capitals is a failure."
+    if result.error in NOT_RUN:
+        return 'skip'
+    if result.error is not None:
+        return 'SLOW' if result.error.startswith('stopped at') else 'ERROR'
+    if result.budget is not None and result.elapsed > result.budget:
+        return 'SLOW'
+    return check(result, answers)
+
+
+def report(results: list[DayResult], wall_time: float, check_mode: bool = False) -> int:
+    "Print a table of the results, returning the number of failures (for `check_mode`)"
+    answers = load_answers()
+    test_answers = load_answers(TEST_ANSWERS_PATH)
+    failures = 0
+
+    print(
+        f'{"Day":>3}  {"Input":>5}  {"Part":>4}  {"Parse":>8}  {"Solve":>8}  {"Budget":>7}  {"GC total":>8}  '
+        f'{"GC max":>8}  {"Check":>5}  Answer'
+    )
+    for day_result in results:
+        for result in day_result.parts:
+            known = answers if day_result.data_filename is None else test_answers
+            status = verdict(result, known) if check_mode else check(result, known)
+            failures += status.isupper()
+
+            answer = (result.answer or '') if result.error is None else f'ERROR: {result.error.strip().splitlines()[-1]}'
+            if answer and '\n' in answer:
+                # Multi-line answers (like day 10's display) go underneath
+                answer = '\n' + answer
+            # The parse is shared, so it's only shown against the first part
+            parse = f'{day_result.parse_elapsed:>7.2f}s' if result.part == PARTS[0] else ''
+            data = 'test' if day_result.data_filename else 'full'
+            budget = f'{result.budget:>6g}s' if result.budget is not None else '-'
+            print(
+                f'{result.day:>3}  {data:>5}  {result.part:>4}  {parse:>8}  {result.elapsed:>7.2f}s  {budget:>7}  '
+                f'{result.gc_pause_total:>7.3f}s  {result.gc_pause_max * 1000:>6.1f}ms  {status:>5}  {answer}'
+            )
+
+    total = sum(r.parse_elapsed + sum(p.elapsed for p in r.parts) for r in results)
+    slowest = max((p for r in results for p in r.parts), key=lambda p: p.elapsed)
+    print()
+    print(f'Wall time {wall_time:.2f}s, sum of days {total:.2f}s, '
+          f'slowest was day {slowest.day} part {slowest.part} ({slowest.elapsed:.2f}s)')
+    if check_mode:
+        print(f'{failures} failed' if failures else 'All passed')
+
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--check', action='store_true',
+        help='Also run the test inputs, enforce time budgets, and exit non-zero on any failure'
+    )
+    parser.add_argument('--jobs', type=int, help='Worker processes (default: one per CPU)')
+    parser.add_argument('--gc', choices=GC_MODES, default=DEFAULT_GC_MODE, help='Garbage collector policy')
+    args = parser.parse_args()
+
+    specs = discover_days()
+
+    with Timer() as t:
+        results = run_all(specs, args.jobs, args.gc, with_tests=args.check, enforce_budget=args.check)
+
+    failures = report(results, t.elapsed, args.check)
+    if args.check and failures:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Graph searches shared by the days that explore a state space.
+
+Each search takes the start state(s) and a `neighbours(state)` function, and yields states as it expands them; the
+caller decides what a goal is and stops iterating when it's found one. Options common to every search:
+ - key: reduces a state to what identifies it, for the visited set. Return something small (an int from `pack()` is
+   ideal) rather than the whole state. Pass None to turn deduplication off, e.g. for searching a tree.
+ - prune: return True to skip a state without expanding it, e.g. when an upper bound on its score can't beat the best
+   found so far. Called as each state is taken off the frontier, so it sees the latest best.
+ - stats: a SearchStats to count what happened.
+
+`dfs` can also be checkpointed: give it a `checkpoint.Checkpoint` and it saves a `Snapshot` of its stack and visited
+set whenever one is due, and pass a loaded snapshot back as `resume` to carry on from there.
+"""
+from collections import deque
+import heapq
+import itertools
+from typing import TYPE_CHECKING, Callable, Hashable, Iterable, Iterator, NamedTuple, Optional, TypeVar
+
+if TYPE_CHECKING:
+    from checkpoint import Checkpoint
+
+
+S = TypeVar('S')
+
+
+def _identity(state):
+    return state
+
+
+def pack(values: Iterable[int], bits: int = 16) -> int:
+    "Pack small non-negative ints into a single int, for use as a compact key"
+    packed = 0
+    for value in values:
+        packed = (packed << bits) | value
+    return packed
+
+
+class SearchStats:
+    def __init__(self):
+        self.expanded = 0
+        self.pruned = 0
+        self.deduplicated = 0
+
+    def summary(self) -> str:
+        return f'{self.expanded} states expanded, {self.pruned} pruned, {self.deduplicated} deduplicated'
+
+
+class Snapshot(NamedTuple):
+    pending: list  # Still to be taken, as (depth, state) pairs
+    visited: set
+
+
+class _Frontier:
+    "The visited set, pruning and counting that every search shares"
+    def __init__(
+        self, key: Optional[Callable[[S], Hashable]], prune: Optional[Callable[[S], bool]],
+        stats: Optional[SearchStats]
+    ):
+        self.key = key
+        self.prune = prune
+        self.stats = stats or SearchStats()
+        self.visited: set[Hashable] = set()
+
+    def is_new(self, state) -> bool:
+        "Mark a state as visited, if it hasn't been already"
+        if self.key is None:
+            return True
+
+        key = self.key(state)
+        if key in self.visited:
+            self.stats.deduplicated += 1
+            return False
+
+        self.visited.add(key)
+        return True
+
+    def expand(self, state) -> bool:
+        "Whether a state taken off the frontier should be expanded"
+        if self.prune is not None and self.prune(state):
+            self.stats.pruned += 1
+            return False
+
+        self.stats.expanded += 1
+        return True
+
+
+def bfs(
+    starts: Iterable[S], neighbours: Callable[[S], Iterable[S]], key: Optional[Callable[[S], Hashable]] = _identity,
+    prune: Optional[Callable[[S], bool]] = None, stats: Optional[SearchStats] = None
+) -> Iterator[tuple[int, S]]:
+    "Breadth first, yielding (depth, state). States are deduplicated as they're found, so the queue stays small."
+    frontier = _Frontier(key, prune, stats)
+    queue = deque((0, state) for state in starts if frontier.is_new(state))
+
+    while queue:
+        depth, state = queue.popleft()
+        if not frontier.expand(state):
+            continue
+
+        yield depth, state
+
+        queue.extend((depth + 1, n) for n in neighbours(state) if frontier.is_new(n))
+
+
+def dfs(
+    starts: Iterable[S], neighbours: Callable[[S], Iterable[S]], key: Optional[Callable[[S], Hashable]] = _identity,
+    prune: Optional[Callable[[S], bool]] = None, stats: Optional[SearchStats] = None,
+    resume: Optional[Snapshot] = None, checkpoint: Optional['Checkpoint'] = None
+) -> Iterator[tuple[int, S]]:
+    "Depth first, yielding (depth, state). The last neighbour given is the first explored."
+    frontier = _Frontier(key, prune, stats)
+    if resume is not None:
+        stack = resume.pending
+        frontier.visited = resume.visited
+    else:
+        stack = [(0, state) for state in starts]
+
+    while stack:
+        if checkpoint is not None and checkpoint.due():
+            checkpoint.save(Snapshot(stack, frontier.visited))
+
+        depth, state = stack.pop()
+        if not frontier.is_new(state) or not frontier.expand(state):
+            continue
+
+        yield depth, state
+
+        stack.extend((depth + 1, n) for n in neighbours(state))
+
+
+def best_first(
+    starts: Iterable[S], neighbours: Callable[[S], Iterable[S]], priority: Callable[[S], float],
+    key: Optional[Callable[[S], Hashable]] = _identity, prune: Optional[Callable[[S], bool]] = None,
+    stats: Optional[SearchStats] = None
+) -> Iterator[tuple[float, S]]:
+    "Always expands the state with the lowest priority next, yielding (priority, state)"
+    frontier = _Frontier(key, prune, stats)
+    tiebreak = itertools.count()  # States themselves may not be comparable
+    heap = [(priority(state), next(tiebreak), state) for state in starts]
+    heapq.heapify(heap)
+
+    while heap:
+        value, _, state = heapq.heappop(heap)
+        if not frontier.is_new(state) or not frontier.expand(state):
+            continue
+
+        yield value, state
+
+        for n in neighbours(state):
+            heapq.heappush(heap, (priority(n), next(tiebreak), n))
+
+
+def astar(
+    starts: Iterable[S], neighbours: Callable[[S], Iterable[tuple[int, S]]], heuristic: Callable[[S], int],
+    key: Optional[Callable[[S], Hashable]] = _identity, prune: Optional[Callable[[S], bool]] = None,
+    stats: Optional[SearchStats] = None
+) -> Iterator[tuple[int, S]]:
+    """
+    A*, yielding (cost, state) in order of cost plus `heuristic`. `neighbours` gives (step cost, state) pairs.
+    With an admissible and consistent heuristic, the cost of each state yielded is the lowest possible.
+    """
+    frontier = _Frontier(key, prune, stats)
+    tiebreak = itertools.count()
+    heap = [(heuristic(state), next(tiebreak), 0, state) for state in starts]
+    heapq.heapify(heap)
+
+    while heap:
+        _, _, cost, state = heapq.heappop(heap)
+        if not frontier.is_new(state) or not frontier.expand(state):
+            continue
+
+        yield cost, state
+
+        for step, n in neighbours(state):
+            heapq.heappush(heap, (cost + step + heuristic(n), next(tiebreak), cost + step, n))
+
+
+def dijkstra(
+    starts: Iterable[S], neighbours: Callable[[S], Iterable[tuple[int, S]]],
+    key: Optional[Callable[[S], Hashable]] = _identity, prune: Optional[Callable[[S], bool]] = None,
+    stats: Optional[SearchStats] = None
+) -> Iterator[tuple[int, S]]:
+    "Yields (cost, state) in order of lowest cost. `neighbours` gives (step cost, state) pairs."
+    return astar(starts, neighbours, lambda state: 0, key, prune, stats)
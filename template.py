@@ -4,12 +4,20 @@ from base import BaseDay
 class Day(BaseDay):
     day = 0
 
+    def parse(self):
+        return self.data_lines
+
     def part_1(self):
-        for line in self.data_lines:
-            pass
+        total = 0
+        for line in self.parsed:
+            self.debug(line, level=2)
+
+        return total
 
     def part_2(self):
         pass
 
-Day().execute()
-# Day(f'day_{Day.day}_test.txt').execute()
+
+if __name__ == '__main__':
+    Day().execute()
+    # Day(f'day_{Day.day}_test.txt').execute()